@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+app_settings.py
+进程内共享的 QSettings 实例，以及快捷键窗口使用的 JSON 设置文件
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+
+from PyQt6.QtCore import QSettings, QStandardPaths
+
+logger = logging.getLogger(__name__)
+
+# 快捷键窗口设置文件名；放在用户配置目录下，程序目录可能只读
+# （安装在 Program Files）或是打包程序退出即删除的临时解压目录
+_WINDOW_STORE_NAME = "window_settings.json"
+
+_SETTINGS = None
+_WINDOW_SETTINGS = None
+_WINDOW_STORE = None
+
+
+def settings():
+    """获取全局共享的 QSettings("ShortcutTool", "Settings") 实例
+
+    首次调用时创建，之后主程序与设置对话框共用同一个对象，
+    不再各自构造、重复读取注册表。
+
+    Returns:
+        QSettings: 共享的设置对象
+    """
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = QSettings("ShortcutTool", "Settings")
+    return _SETTINGS
+
+
+def window_settings():
+    """获取全局共享的 QSettings("ShortcutTool", "ShortcutWindow") 实例
+
+    旧版本在这里保存快捷键窗口的位置、大小和样式；现在只在首次创建
+    window_settings.json 时读取一次用于迁移。
+
+    Returns:
+        QSettings: 共享的窗口设置对象
+    """
+    global _WINDOW_SETTINGS
+    if _WINDOW_SETTINGS is None:
+        _WINDOW_SETTINGS = QSettings("ShortcutTool", "ShortcutWindow")
+    return _WINDOW_SETTINGS
+
+
+class _SettingsStore:
+    """
+    保存在 JSON 文件中的设置：启动时整体读入字典，变化时原子地整体写回
+
+    读取只是字典查找，不经过注册表；update 可在写线程中调用。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # 设置文件是否已存在（不存在时由调用方决定是否迁移旧设置）
+        self.exists = False
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        读入设置文件；文件缺失或损坏时保持空字典
+
+        Returns:
+            bool: 是否成功读入
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取设置文件失败，使用默认值: {e}")
+            return False
+        if not isinstance(data, dict):
+            logger.warning("设置文件格式不正确，使用默认值")
+            return False
+        self._data = data
+        self.exists = True
+        return True
+
+    def get(self, key, default=None):
+        """
+        获取设置值
+
+        Args:
+            key (str): 键名
+            default: 键不存在时的默认值
+
+        Returns:
+            设置值
+        """
+        return self._data.get(key, default)
+
+    def update(self, values):
+        """
+        合并新值并立即写回文件；写入失败只记录日志，内存中的值仍然更新
+
+        Args:
+            values (dict): 键名到新值的映射，值必须可被 JSON 序列化
+
+        Returns:
+            bool: 是否成功写入文件
+        """
+        with self._lock:
+            self._data.update(values)
+            payload = json.dumps(self._data, ensure_ascii=False, indent=2).encode('utf-8')
+            try:
+                # 先在同一（可写的）配置目录中写临时文件再替换，
+                # 中途退出也不会留下写了一半的文件
+                fd, tmp_path = tempfile.mkstemp(prefix=".window_settings.", suffix=".tmp",
+                                                dir=os.path.dirname(self.path))
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(payload)
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    os.remove(tmp_path)
+                    raise
+            except OSError as e:
+                logger.error(f"保存设置文件失败: {e}")
+                return False
+            self.exists = True
+            return True
+
+
+def _user_config_dir():
+    """获取当前用户可写的配置目录，不存在时创建
+
+    Windows 下为 %APPDATA%\\ShortcutTool，其他系统为用户配置目录下的 ShortcutTool。
+
+    Returns:
+        str: 配置目录路径
+    """
+    base = os.environ.get("APPDATA") or QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.GenericConfigLocation)
+    path = os.path.join(base, "ShortcutTool")
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError as e:
+        logger.error(f"创建配置目录失败: {e}")
+    return path
+
+
+def window_store():
+    """获取快捷键窗口共用的 JSON 设置存储
+
+    首次调用时读入用户配置目录下的 window_settings.json，之后读取都只访问内存中的字典。
+
+    Returns:
+        _SettingsStore: 共享的窗口设置存储
+    """
+    global _WINDOW_STORE
+    if _WINDOW_STORE is None:
+        _WINDOW_STORE = _SettingsStore(os.path.join(_user_config_dir(), _WINDOW_STORE_NAME))
+        _WINDOW_STORE.load()
+    return _WINDOW_STORE
@@ -9,6 +9,7 @@ autostart_manager.py
 import os
 import sys
 import winreg
+import atexit
 import logging
 from pathlib import Path
 
@@ -20,6 +21,13 @@ class AutostartManager:
     通过注册表管理程序的开机自启动
     """
     
+    # Run 键句柄在进程内共享，首次使用时打开，退出时关闭
+    _run_key_ro = None
+    _run_key_rw = None
+    # 自启动状态缓存（None 表示尚未读取）在所有实例间共享，
+    # 托盘和设置对话框中任一实例启用/禁用后其他实例都能看到
+    _enabled = None
+    
     def __init__(self):
         # 注册表路径
         self.reg_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"
@@ -27,6 +35,12 @@ class AutostartManager:
         self.app_name = "ShortcutTool"
         # 获取当前执行文件的路径
         self.exe_path = self._get_exe_path()
+        # 预先规范化的路径，避免每次检查重复计算
+        self._normalized_exe = self._normalize_path(self.exe_path)
+        try:
+            self._get_run_key()
+        except OSError as e:
+            logger.warning(f"打开自启动注册表键失败: {e}")
         
     def _get_exe_path(self):
         """
@@ -43,35 +57,78 @@ class AutostartManager:
             script_path = os.path.abspath(__file__).replace('autostart_manager.py', 'main.py')
             return f'"{sys.executable}" "{script_path}"'
     
+    def _get_run_key(self, write=False):
+        """
+        获取 Run 注册表键句柄，整个进程只打开一次
+        
+        Args:
+            write (bool): 是否需要写权限
+            
+        Returns:
+            winreg.HKEYType: 注册表键句柄
+        """
+        cls = AutostartManager
+        if write:
+            if cls._run_key_rw is None:
+                cls._run_key_rw = winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.reg_path, 0,
+                                                 winreg.KEY_READ | winreg.KEY_WRITE)
+            return cls._run_key_rw
+        if cls._run_key_ro is None:
+            cls._run_key_ro = winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.reg_path, 0, winreg.KEY_READ)
+        return cls._run_key_ro
+    
+    @staticmethod
+    def _close_keys():
+        """关闭已打开的注册表键句柄"""
+        for attr in ('_run_key_ro', '_run_key_rw'):
+            key = getattr(AutostartManager, attr)
+            if key is not None:
+                key.Close()
+                setattr(AutostartManager, attr, None)
+    
+    @staticmethod
+    def _normalize_path(path):
+        """
+        规范化注册表中保存的路径，便于比较
+        
+        Args:
+            path (str): 原始路径
+            
+        Returns:
+            str: 去除引号并规范化大小写的路径
+        """
+        return os.path.normcase(os.path.normpath(path.strip('"')))
+    
     def is_autostart_enabled(self):
         """
         检查是否已启用开机自启动
         
+        结果在进程生命周期内缓存，仅在启用/禁用时更新。
+        
         Returns:
             bool: True表示已启用，False表示未启用
         """
+        cls = AutostartManager
+        if cls._enabled is not None:
+            return cls._enabled
+        
         try:
-            # 打开注册表键
-            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.reg_path, 0, winreg.KEY_READ) as key:
-                try:
-                    # 尝试读取值
-                    value, _ = winreg.QueryValueEx(key, self.app_name)
-                    # 检查路径是否匹配当前程序路径
-                    current_path = self.exe_path.strip('"')
-                    stored_path = value.strip('"')
-                    
-                    # 如果是exe文件，直接比较路径
-                    if getattr(sys, 'frozen', False):
-                        return os.path.normpath(stored_path) == os.path.normpath(current_path)
-                    else:
-                        # 如果是Python脚本，检查是否包含正确的脚本路径
-                        return current_path in stored_path
-                        
-                except FileNotFoundError:
-                    return False
-        except Exception as e:
+            value, _ = winreg.QueryValueEx(self._get_run_key(), self.app_name)
+        except FileNotFoundError:
+            cls._enabled = False
+            return False
+        except OSError as e:
             logger.error(f"检查自启动状态失败: {e}")
             return False
+        
+        stored_path = self._normalize_path(value)
+        if getattr(sys, 'frozen', False):
+            # 如果是exe文件，直接比较路径
+            cls._enabled = stored_path == self._normalized_exe
+        else:
+            # 如果是Python脚本，检查是否包含正确的脚本路径
+            cls._enabled = self._normalized_exe in stored_path
+        return cls._enabled
     
     def enable_autostart(self):
         """
@@ -81,12 +138,11 @@ class AutostartManager:
             bool: True表示成功，False表示失败
         """
         try:
-            # 打开注册表键（如果不存在则创建）
-            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.reg_path, 0, winreg.KEY_WRITE) as key:
-                # 设置值
-                winreg.SetValueEx(key, self.app_name, 0, winreg.REG_SZ, self.exe_path)
-                logger.info(f"已启用开机自启动: {self.exe_path}")
-                return True
+            # 设置值
+            winreg.SetValueEx(self._get_run_key(write=True), self.app_name, 0, winreg.REG_SZ, self.exe_path)
+            AutostartManager._enabled = True
+            logger.info(f"已启用开机自启动: {self.exe_path}")
+            return True
         except Exception as e:
             logger.error(f"启用自启动失败: {e}")
             return False
@@ -99,17 +155,18 @@ class AutostartManager:
             bool: True表示成功，False表示失败
         """
         try:
-            # 打开注册表键
-            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.reg_path, 0, winreg.KEY_WRITE) as key:
-                try:
-                    # 删除值
-                    winreg.DeleteValue(key, self.app_name)
-                    logger.info("已禁用开机自启动")
-                    return True
-                except FileNotFoundError:
-                    # 如果值不存在，也算成功
-                    logger.info("自启动项不存在，无需禁用")
-                    return True
+            key = self._get_run_key(write=True)
+            try:
+                # 删除值
+                winreg.DeleteValue(key, self.app_name)
+                AutostartManager._enabled = False
+                logger.info("已禁用开机自启动")
+                return True
+            except FileNotFoundError:
+                # 如果值不存在，也算成功
+                AutostartManager._enabled = False
+                logger.info("自启动项不存在，无需禁用")
+                return True
         except Exception as e:
             logger.error(f"禁用自启动失败: {e}")
             return False
@@ -142,6 +199,8 @@ class AutostartManager:
             'reg_path': self.reg_path
         }
 
+atexit.register(AutostartManager._close_keys)
+
 # 测试代码
 if __name__ == "__main__":
     # 配置日志
@@ -31,20 +31,28 @@ def install_pyinstaller():
         print("✗ PyInstaller安装失败")
         return False
 
+# 需要随程序一起打包的数据文件
+DATA_FILES = ("shortcuts.json", "process_mapping.json", "icon.svg")
+
 def build_executable():
-    """构建可执行文件"""
+    """构建可执行文件
+    
+    直接在当前进程内调用 PyInstaller，省去额外的解释器启动；
+    未使用 --clean，重复构建时复用 build 目录中的分析缓存。
+    """
     print("开始构建可执行文件...")
     
     # PyInstaller命令参数
-    cmd = [
-        "pyinstaller",
+    args = [
         "--onefile",                    # 打包成单个文件
         "--windowed",                   # 无控制台窗口
+        "--noupx",                      # 跳过单线程的UPX压缩
         "--name=快捷键提示工具",          # 可执行文件名称
         "--icon=icon.svg",              # 图标文件
-        "--add-data=shortcuts.json;.",  # 添加配置文件
-        "--add-data=process_mapping.json;.",  # 添加进程映射文件
-        "--add-data=icon.svg;.",        # 添加图标文件
+    ]
+    # 添加配置文件、进程映射文件和图标文件
+    args += [f"--add-data={name}{os.pathsep}." for name in DATA_FILES]
+    args += [
         "--hidden-import=PyQt6.QtCore",
         "--hidden-import=PyQt6.QtGui",
         "--hidden-import=PyQt6.QtWidgets",
@@ -53,33 +61,85 @@ def build_executable():
     ]
     
     try:
-        subprocess.check_call(cmd)
+        from PyInstaller.__main__ import run as run_pyinstaller
+        run_pyinstaller(args)
         print("✓ 可执行文件构建成功")
         return True
-    except subprocess.CalledProcessError as e:
+    except SystemExit as e:
+        # PyInstaller 出错时通过 sys.exit 退出
+        if e.code:
+            print(f"✗ 构建失败: 退出码 {e.code}")
+            return False
+        print("✓ 可执行文件构建成功")
+        return True
+    except Exception as e:
         print(f"✗ 构建失败: {e}")
         return False
 
+def sync_file(src, dst_dir, link=False):
+    """将文件同步到目标目录
+    
+    目标文件与源文件大小、修改时间一致时跳过；
+    link为True时优先创建硬链接（同一NTFS卷上无需复制数据），失败时回退到复制。
+    
+    Args:
+        src (str): 源文件路径
+        dst_dir (str): 目标目录
+        link (bool): 是否尝试使用硬链接
+    """
+    dst = os.path.join(dst_dir, os.path.basename(src))
+    src_stat = os.stat(src)
+    try:
+        dst_stat = os.stat(dst)
+        if os.path.samestat(src_stat, dst_stat) or (
+                dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns == src_stat.st_mtime_ns):
+            return
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+    
+    if link:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
 def create_portable_package():
-    """创建便携版包"""
+    """创建便携版包
+    
+    增量更新便携版目录：只替换发生变化的文件，并删除不再需要的旧文件。
+    """
     print("创建便携版包...")
     
     # 创建便携版目录
     portable_dir = "快捷键提示工具_便携版"
-    if os.path.exists(portable_dir):
-        shutil.rmtree(portable_dir)
-    os.makedirs(portable_dir)
+    os.makedirs(portable_dir, exist_ok=True)
+    bat_name = "启动工具.bat"
+    expected = {bat_name}
     
-    # 复制可执行文件
+    # 可执行文件使用硬链接
     exe_path = os.path.join("dist", "快捷键提示工具.exe")
     if os.path.exists(exe_path):
-        shutil.copy2(exe_path, portable_dir)
+        sync_file(exe_path, portable_dir, link=True)
+        expected.add(os.path.basename(exe_path))
     
-    # 复制配置文件
+    # 配置文件会被用户修改，复制而不是硬链接，避免改动回写到源文件
     config_files = ["shortcuts.json", "process_mapping.json", "README.md"]
     for file in config_files:
         if os.path.exists(file):
-            shutil.copy2(file, portable_dir)
+            sync_file(file, portable_dir)
+            expected.add(file)
+    
+    # 删除上次构建遗留的多余文件
+    for name in os.listdir(portable_dir):
+        if name not in expected:
+            path = os.path.join(portable_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
     
     # 创建启动批处理文件
     bat_content = '''@echo off
@@ -88,7 +148,7 @@ echo 启动快捷键提示工具...
 start "" "快捷键提示工具.exe"
 '''
     
-    with open(os.path.join(portable_dir, "启动工具.bat"), "w", encoding="gbk") as f:
+    with open(os.path.join(portable_dir, bat_name), "w", encoding="gbk") as f:
         f.write(bat_content)
     
     print(f"✓ 便携版包已创建: {portable_dir}")
@@ -8,17 +8,370 @@ context_monitor.py
 按照开发指南要求，提供快速、可靠的进程名获取功能。
 """
 
-import win32gui
-import win32process
-import psutil
 import logging
 import time
 import json
 import os
-from typing import Optional, Dict, Any
+import re
+import sys
+import threading
+import ctypes
+from collections import OrderedDict
+from ctypes import wintypes
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping, Tuple
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# 进程映射文件路径（模块导入时计算一次）
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_MAPPING_FILE_NAME = "process_mapping.json"
+_MAPPING_FILE_PATH = os.path.join(_MODULE_DIR, _MAPPING_FILE_NAME)
+
+
+def _intern_mappings(mappings: Dict[str, str]) -> Dict[str, str]:
+    """将映射的键和值统一转为小写并驻留，查询时可走字符串同一性比较
+
+    Args:
+        mappings: 原始映射字典
+
+    Returns:
+        dict: 键值均已小写并驻留的新字典
+    """
+    return {sys.intern(k.lower()): sys.intern(v.lower()) for k, v in mappings.items()}
+
+
+# 内置常用进程映射（可被用户配置覆盖）
+_BUILTIN_MAPPINGS = MappingProxyType(_intern_mappings({
+    # 浏览器与常用应用
+    "chrome.exe": "chrome.exe",
+    "firefox.exe": "firefox.exe",
+    "msedge.exe": "chrome.exe",
+    "code.exe": "code.exe",
+    "notepad++.exe": "notepad++.exe",
+    "explorer.exe": "explorer.exe",
+
+    # CAD 家族常见可执行名 → 统一归并到 acad.exe 配置
+    "acad.exe": "acad.exe",
+    "acadlt.exe": "acad.exe",
+    "map3d.exe": "acad.exe",
+    "civil3d.exe": "acad.exe",
+    "zwcad.exe": "acad.exe",         # 中望CAD
+    "gstarcad.exe": "acad.exe",      # 浩辰CAD
+
+    # CASS（如存在独立进程时）
+    "cass.exe": "cass.exe",
+}))
+
+# NtQuerySystemInformation 的 SystemProcessIdInformation 信息类
+_SYSTEM_PROCESS_ID_INFORMATION_CLASS = 0x58
+# 映像路径缓冲区大小（字节），模块级预分配，避免每次调用重复申请
+_IMAGE_NAME_BUFFER_BYTES = 0x1000
+
+
+class _UNICODE_STRING(ctypes.Structure):
+    _fields_ = [
+        ("Length", wintypes.USHORT),
+        ("MaximumLength", wintypes.USHORT),
+        ("Buffer", ctypes.c_void_p)
+    ]
+
+
+class _SYSTEM_PROCESS_ID_INFORMATION(ctypes.Structure):
+    _fields_ = [
+        ("ProcessId", ctypes.c_void_p),
+        ("ImageName", _UNICODE_STRING)
+    ]
+
+
+_ntdll = ctypes.windll.ntdll
+_NtQuerySystemInformation = _ntdll.NtQuerySystemInformation
+_NtQuerySystemInformation.argtypes = [ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong)]
+_NtQuerySystemInformation.restype = ctypes.c_long
+
+_image_name_buffer = ctypes.create_unicode_buffer(_IMAGE_NAME_BUFFER_BYTES // ctypes.sizeof(ctypes.c_wchar))
+_process_id_info = _SYSTEM_PROCESS_ID_INFORMATION()
+# 钩子线程与调用线程共用上述缓冲区
+_native_lock = threading.Lock()
+
+# ReadDirectoryChangesW 所需的目录访问权限
+FILE_LIST_DIRECTORY = 0x0001
+
+# 前台窗口切换事件
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+
+WINEVENTPROC = ctypes.WINFUNCTYPE(
+    None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+    wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+)
+
+_user32 = ctypes.windll.user32
+_user32.SetWinEventHook.argtypes = [
+    wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WINEVENTPROC,
+    wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+]
+_user32.SetWinEventHook.restype = wintypes.HANDLE
+_user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+_user32.UnhookWinEvent.restype = wintypes.BOOL
+_user32.GetForegroundWindow.restype = wintypes.HWND
+
+
+def _get_process_name_native(pid: int) -> Optional[str]:
+    """通过 NtQuerySystemInformation 获取进程映像名
+
+    单次 ntdll 调用即可拿到映像路径，无需打开进程句柄，
+    比 psutil.Process(pid).name() 少若干次系统调用。
+
+    Args:
+        pid: 进程ID
+
+    Returns:
+        str: 小写的可执行文件名（如 'code.exe'），失败时返回 None
+    """
+    info = _process_id_info
+    with _native_lock:
+        info.ProcessId = pid
+        info.ImageName.Length = 0
+        info.ImageName.MaximumLength = _IMAGE_NAME_BUFFER_BYTES
+        info.ImageName.Buffer = ctypes.addressof(_image_name_buffer)
+
+        status = _NtQuerySystemInformation(
+            _SYSTEM_PROCESS_ID_INFORMATION_CLASS,
+            ctypes.byref(info),
+            ctypes.sizeof(info),
+            None
+        )
+        if status != 0:
+            return None
+
+        # ImageName 形如 \Device\HarddiskVolume3\Windows\explorer.exe
+        image_path = ctypes.wstring_at(info.ImageName.Buffer, info.ImageName.Length // ctypes.sizeof(ctypes.c_wchar))
+    return sys.intern(image_path[image_path.rfind('\\') + 1:].lower())
+
+
+def _get_process_name(pid: int) -> Optional[str]:
+    """获取进程名，NT 快速路径失败时回退到 psutil
+
+    Args:
+        pid: 进程ID
+
+    Returns:
+        str: 小写的可执行文件名，进程不存在时返回 None
+    """
+    name = _get_process_name_native(pid)
+    if name is not None:
+        return name
+
+    # psutil 仅作为少见的回退路径，按需导入
+    import psutil
+    try:
+        return sys.intern(psutil.Process(pid).name().lower())
+    except psutil.Error:
+        return None
+
+# PID → 进程名缓存（LRU），进程退出时通过等待句柄失效
+SYNCHRONIZE = 0x00100000
+INFINITE = 0xFFFFFFFF
+WAIT_OBJECT_0 = 0x00000000
+WAIT_FAILED = 0xFFFFFFFF
+MAXIMUM_WAIT_OBJECTS = 64
+_PID_CACHE_MAXSIZE = 128
+# 每组等待句柄预留一个位置给唤醒事件
+_WAIT_CHUNK = MAXIMUM_WAIT_OBJECTS - 1
+# 句柄超过一组时轮流等待各组的超时（毫秒）
+_WAIT_CHUNK_TIMEOUT_MS = 250
+
+_kernel32 = ctypes.windll.kernel32
+_kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+_kernel32.OpenProcess.restype = wintypes.HANDLE
+_kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+_kernel32.CloseHandle.restype = wintypes.BOOL
+_kernel32.CreateEventW.argtypes = [ctypes.c_void_p, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+_kernel32.CreateEventW.restype = wintypes.HANDLE
+_kernel32.SetEvent.argtypes = [wintypes.HANDLE]
+_kernel32.SetEvent.restype = wintypes.BOOL
+_kernel32.WaitForMultipleObjects.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD]
+_kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+
+_pid_name_cache = OrderedDict()  # pid -> 进程名
+_pid_exit_handles = {}           # pid -> SYNCHRONIZE 句柄
+_pending_close_handles = []      # 待监视线程关闭的句柄（等待期间不可直接关闭）
+_pid_cache_lock = threading.Lock()
+_pid_wake_event = None
+_pid_watcher_thread = None
+
+
+def _ensure_pid_watcher():
+    """按需启动进程退出监视线程"""
+    global _pid_wake_event, _pid_watcher_thread
+    with _pid_cache_lock:
+        if _pid_watcher_thread is not None:
+            return
+        # 自动重置事件：新增/淘汰句柄时唤醒监视线程重建等待列表
+        _pid_wake_event = _kernel32.CreateEventW(None, False, False, None)
+        _pid_watcher_thread = threading.Thread(target=_watch_process_exits, daemon=True)
+        _pid_watcher_thread.start()
+
+
+def _watch_process_exits():
+    """等待已缓存进程退出，退出后从缓存中移除对应 PID"""
+    while True:
+        with _pid_cache_lock:
+            closing = _pending_close_handles[:]
+            _pending_close_handles.clear()
+            tracked = list(_pid_exit_handles.items())
+        for handle in closing:
+            _kernel32.CloseHandle(handle)
+
+        chunks = [tracked[i:i + _WAIT_CHUNK] for i in range(0, len(tracked), _WAIT_CHUNK)] or [[]]
+        timeout = INFINITE if len(chunks) == 1 else _WAIT_CHUNK_TIMEOUT_MS
+        for chunk in chunks:
+            handles = (wintypes.HANDLE * (len(chunk) + 1))(_pid_wake_event, *(h for _, h in chunk))
+            result = _kernel32.WaitForMultipleObjects(len(handles), handles, False, timeout)
+            if result == WAIT_OBJECT_0:
+                # 有新的 PID 加入或句柄待关闭，重建等待列表
+                break
+            if WAIT_OBJECT_0 < result <= WAIT_OBJECT_0 + len(chunk):
+                pid, handle = chunk[result - WAIT_OBJECT_0 - 1]
+                with _pid_cache_lock:
+                    owned = _pid_exit_handles.get(pid) == handle
+                    if owned:
+                        del _pid_exit_handles[pid]
+                        _pid_name_cache.pop(pid, None)
+                # 已被 LRU 淘汰的句柄由待关闭列表负责关闭
+                if owned:
+                    _kernel32.CloseHandle(handle)
+                break
+            if result == WAIT_FAILED:
+                logger.warning(f"等待进程退出失败: {ctypes.GetLastError()}，清空进程名缓存")
+                clear_pid_cache()
+                break
+
+
+def clear_pid_cache():
+    """清空 PID → 进程名缓存"""
+    with _pid_cache_lock:
+        _pending_close_handles.extend(_pid_exit_handles.values())
+        _pid_exit_handles.clear()
+        _pid_name_cache.clear()
+
+
+def _pid_to_name(pid: int) -> Optional[str]:
+    """带 LRU 缓存的进程名查询
+
+    PID 在进程存活期间保持不变，命中时直接返回缓存；
+    进程退出后由监视线程移除，避免 PID 复用导致名称过期。
+
+    Args:
+        pid: 进程ID
+
+    Returns:
+        str: 小写的可执行文件名，进程不存在时返回 None
+    """
+    with _pid_cache_lock:
+        name = _pid_name_cache.get(pid)
+        if name is not None:
+            _pid_name_cache.move_to_end(pid)
+            return name
+
+    name = _get_process_name(pid)
+    if name is None:
+        return None
+
+    handle = _kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+    if not handle:
+        # 无法监视退出的进程不缓存
+        return name
+
+    _ensure_pid_watcher()
+    with _pid_cache_lock:
+        if pid in _pid_exit_handles:
+            # 其他线程已缓存该 PID
+            _pending_close_handles.append(handle)
+        else:
+            _pid_name_cache[pid] = name
+            _pid_exit_handles[pid] = handle
+            while len(_pid_name_cache) > _PID_CACHE_MAXSIZE:
+                old_pid, _ = _pid_name_cache.popitem(last=False)
+                _pending_close_handles.append(_pid_exit_handles.pop(old_pid))
+    _kernel32.SetEvent(_pid_wake_event)
+    return name
+
+# 窗口标题启发式识别：CAD 家族关键字与 CASS，一次扫描完成且无需先转小写
+_TITLE_RE = re.compile(r'autocad|zwcad|gstarcad| cad|cass', re.IGNORECASE)
+
+# 工具自身进程ID，运行期间不会变化
+_SELF_PID = os.getpid()
+# 可能承载本工具的Python宿主进程名
+_PYTHON_HOST_PROCESSES = frozenset({
+    "python.exe", "pythonw.exe", "py.exe", "pyw.exe",
+    "python", "py", "python3", "python3.exe"
+})
+
+# 窗口标题缓冲区（字符数），模块级预分配
+_WINDOW_TITLE_MAX = 512
+_window_title_buffer = ctypes.create_unicode_buffer(_WINDOW_TITLE_MAX)
+_window_pid = wintypes.DWORD()
+_snapshot_lock = threading.Lock()
+
+_user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+_user32.GetWindowTextW.restype = ctypes.c_int
+_user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+_user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+
+
+def _snapshot_window(hwnd) -> Tuple[int, int, str, Optional[str]]:
+    """一次性获取窗口句柄、PID、标题与进程名
+
+    Args:
+        hwnd: 窗口句柄
+
+    Returns:
+        tuple: (hwnd, pid, 窗口标题, 进程名)，进程名无法获取时为 None
+    """
+    if not hwnd:
+        return 0, 0, "", None
+    with _snapshot_lock:
+        length = _user32.GetWindowTextW(hwnd, _window_title_buffer, _WINDOW_TITLE_MAX)
+        title = _window_title_buffer.value[:length]
+        _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(_window_pid))
+        pid = _window_pid.value
+    name = _pid_to_name(pid) if pid else None
+    return hwnd, pid, title, name
+
+
+def _snapshot_foreground() -> Tuple[int, int, str, Optional[str]]:
+    """获取当前前台窗口的快照，参见 _snapshot_window"""
+    return _snapshot_window(_user32.GetForegroundWindow())
+
+
+class _MonitorState:
+    """ContextMonitor 的共享缓存状态
+
+    前台窗口钩子线程、映射文件监视线程与UI线程共同访问，
+    写入及"检查后加载"过程均需持有 lock。
+    """
+    __slots__ = ('lock', 'cache', 'process_mappings', 'mapping_cache_time')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # 进程信息缓存（避免频繁调用系统API）
+        self.cache = {}
+        # 进程映射缓存
+        self.process_mappings = None
+        self.mapping_cache_time = 0
+
+
+_state = _MonitorState()
+
+
 class ContextMonitor:
     """获取当前活动窗口的进程信息
     
@@ -26,175 +379,286 @@ class ContextMonitor:
     支持进程名缓存和错误处理，支持自定义进程映射。
     """
 
-    # 常见IDE和编辑器映射
-    IDE_MAPPING = {
-        'code.exe', 'pycharm64.exe', 'devenv.exe',
-        'atom.exe', 'sublime_text.exe', 'notepad++.exe',
-        'webstorm64.exe', 'idea64.exe', 'clion64.exe'
-    }
-    
-    # 进程信息缓存（避免频繁调用系统API）
-    _cache = {}
-    _cache_timeout = 0.1  # 100ms缓存超时
-    
-    # 进程映射缓存
-    _process_mappings = None
-    _mapping_cache_time = 0
-    _mapping_cache_timeout = 5.0  # 5秒缓存超时
+    # 缓存超时（缓存内容保存在模块级 _state 中）
+    _cache_timeout = 100_000_000  # 100ms缓存超时（纳秒）
+    _mapping_cache_timeout = 5_000_000_000  # 5秒缓存超时（纳秒，文件监视不可用时）
+    _mapping_watch_active = False
+    _mapping_watcher_thread = None
+
+    # 前台窗口事件钩子
+    _foreground_hook = None
+    _foreground_hook_proc = None
+    _foreground_hook_thread = None
 
     @staticmethod
-    def _load_process_mappings() -> Dict[str, str]:
+    def _load_process_mappings() -> Mapping[str, str]:
         """加载进程映射配置
         
         Returns:
             dict: 进程映射字典，键为实际进程名，值为配置键名
         """
-        current_time = time.time()
-        
-        # 检查缓存
-        if (ContextMonitor._process_mappings is not None and 
-            current_time - ContextMonitor._mapping_cache_time < ContextMonitor._mapping_cache_timeout):
-            return ContextMonitor._process_mappings
+        # 检查缓存：文件监视工作时仅在映射文件变更后重新加载
+        mappings = _state.process_mappings
+        if mappings is not None and ContextMonitor._mapping_watch_active:
+            return mappings
         
-        try:
-            # 先定义内置常用映射（可被用户配置覆盖）
-            builtin_mappings = {
-                # 浏览器与常用应用
-                "chrome.exe": "chrome.exe",
-                "firefox.exe": "firefox.exe",
-                "msedge.exe": "chrome.exe",
-                "code.exe": "code.exe",
-                "notepad++.exe": "notepad++.exe",
-                "explorer.exe": "explorer.exe",
+        with _state.lock:
+            # 持锁后再次检查，避免多个线程重复加载
+            mappings = _state.process_mappings
+            current_time = time.monotonic_ns()
+            if mappings is not None and (
+                    ContextMonitor._mapping_watch_active or
+                    current_time - _state.mapping_cache_time < ContextMonitor._mapping_cache_timeout):
+                return mappings
+            
+            try:
+                file_mappings = {}
                 
-                # CAD 家族常见可执行名 → 统一归并到 acad.exe 配置
-                "acad.exe": "acad.exe",
-                "acadlt.exe": "acad.exe",
-                "map3d.exe": "acad.exe",
-                "civil3d.exe": "acad.exe",
-                "zwcad.exe": "acad.exe",         # 中望CAD
-                "gstarcad.exe": "acad.exe",      # 浩辰CAD
+                try:
+                    with open(_MAPPING_FILE_PATH, 'rb') as f:
+                        data = _json_loads(f.read())
+                        file_mappings = _intern_mappings(data.get("mappings", {}))
+                except FileNotFoundError:
+                    pass
                 
-                # CASS（如存在独立进程时）
-                "cass.exe": "cass.exe",
-            }
-            
-            # 获取映射文件路径
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            mapping_file = os.path.join(current_dir, "process_mapping.json")
-            file_mappings = {}
-            
-            if os.path.exists(mapping_file):
-                with open(mapping_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    file_mappings = data.get("mappings", {})
-            
-            # 合并映射：用户配置优先于内置映射
-            mappings = {**builtin_mappings, **file_mappings}
-            
-            # 更新缓存
-            ContextMonitor._process_mappings = mappings
-            ContextMonitor._mapping_cache_time = current_time
-            
-            return mappings
-            
-        except Exception as e:
-            logger.warning(f"加载进程映射失败: {e}")
-            # 返回内置映射，保证基本可用
-            ContextMonitor._process_mappings = {
-                "chrome.exe": "chrome.exe",
-                "firefox.exe": "firefox.exe",
-                "msedge.exe": "chrome.exe",
-                "code.exe": "code.exe",
-                "notepad++.exe": "notepad++.exe",
-                "explorer.exe": "explorer.exe",
-                "acad.exe": "acad.exe",
-                "acadlt.exe": "acad.exe",
-                "map3d.exe": "acad.exe",
-                "civil3d.exe": "acad.exe",
-                "zwcad.exe": "acad.exe",
-                "gstarcad.exe": "acad.exe",
-                "cass.exe": "cass.exe",
-            }
-            ContextMonitor._mapping_cache_time = current_time
-            return ContextMonitor._process_mappings
+                # 合并映射：用户配置优先于内置映射
+                mappings = {**_BUILTIN_MAPPINGS, **file_mappings}
+                
+                # 更新缓存
+                _state.process_mappings = mappings
+                _state.mapping_cache_time = current_time
+                
+                return mappings
+                
+            except Exception as e:
+                logger.warning(f"加载进程映射失败: {e}")
+                # 返回内置映射，保证基本可用
+                _state.process_mappings = _BUILTIN_MAPPINGS
+                _state.mapping_cache_time = current_time
+                return _BUILTIN_MAPPINGS
     
+    @staticmethod
+    def start_mapping_watcher():
+        """监视进程映射文件所在目录，文件变更时使映射缓存失效
+
+        使用 ReadDirectoryChangesW 阻塞等待目录变更，替代定时重新加载。
+        重复调用不会重复启动。
+        """
+        if ContextMonitor._mapping_watcher_thread is not None:
+            return
+        thread = threading.Thread(target=ContextMonitor._watch_mapping_file, daemon=True)
+        ContextMonitor._mapping_watcher_thread = thread
+        thread.start()
+
+    @staticmethod
+    def _watch_mapping_file():
+        """进程映射文件监视线程"""
+        try:
+            import win32file
+            import win32con
+
+            handle = win32file.CreateFile(
+                _MODULE_DIR,
+                FILE_LIST_DIRECTORY,
+                win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+                None,
+                win32con.OPEN_EXISTING,
+                win32con.FILE_FLAG_BACKUP_SEMANTICS,
+                None
+            )
+        except Exception as e:
+            logger.warning(f"启动进程映射文件监视失败，回退到定时加载: {e}")
+            return
+
+        ContextMonitor._mapping_watch_active = True
+        try:
+            while True:
+                changes = win32file.ReadDirectoryChangesW(
+                    handle,
+                    1024,
+                    False,
+                    win32con.FILE_NOTIFY_CHANGE_FILE_NAME | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE,
+                    None,
+                    None
+                )
+                if any(name.lower() == _MAPPING_FILE_NAME for _, name in changes):
+                    with _state.lock:
+                        _state.process_mappings = None
+                    logger.debug("检测到进程映射文件变更")
+        except Exception as e:
+            logger.warning(f"进程映射文件监视异常，回退到定时加载: {e}")
+        finally:
+            ContextMonitor._mapping_watch_active = False
+            handle.Close()
+
     @staticmethod
     def clear_mapping_cache():
         """清除进程映射缓存，强制重新加载配置"""
-        ContextMonitor._process_mappings = None
-        ContextMonitor._mapping_cache_time = 0
+        with _state.lock:
+            _state.process_mappings = None
+            _state.mapping_cache_time = 0
         logger.info("进程映射缓存已清除")
     
+    def __init__(self):
+        ContextMonitor.start_foreground_hook()
+        ContextMonitor.start_mapping_watcher()
+
+    @staticmethod
+    def start_foreground_hook() -> bool:
+        """安装前台窗口切换事件钩子（EVENT_SYSTEM_FOREGROUND）
+
+        钩子在独立线程中运行消息循环，仅在前台窗口实际切换时解析一次进程名，
+        之后 get_current_process_name 直接读取缓存。重复调用不会重复安装。
+
+        Returns:
+            bool: 钩子是否处于工作状态，失败时回退到定时查询
+        """
+        thread = ContextMonitor._foreground_hook_thread
+        if thread is not None and thread.is_alive():
+            return ContextMonitor._foreground_hook is not None
+
+        ready = threading.Event()
+        thread = threading.Thread(target=ContextMonitor._foreground_hook_loop, args=(ready,), daemon=True)
+        ContextMonitor._foreground_hook_thread = thread
+        thread.start()
+        ready.wait(1.0)
+        return ContextMonitor._foreground_hook is not None
+
+    @staticmethod
+    def _foreground_hook_loop(ready: threading.Event):
+        """前台窗口事件钩子线程：安装钩子并运行消息循环"""
+        hook = None
+        try:
+            proc = WINEVENTPROC(ContextMonitor._on_foreground_changed)
+            hook = _user32.SetWinEventHook(
+                EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND,
+                None, proc, 0, 0, WINEVENT_OUTOFCONTEXT
+            )
+            if not hook:
+                logger.warning("安装前台窗口事件钩子失败，回退到定时查询")
+                return
+
+            # 保持回调对象引用，防止被垃圾回收
+            ContextMonitor._foreground_hook_proc = proc
+            # 以当前前台窗口初始化缓存
+            ContextMonitor._refresh_cache()
+            ContextMonitor._foreground_hook = hook
+            ready.set()
+            logger.info("前台窗口事件钩子已安装")
+
+            msg = wintypes.MSG()
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                _user32.TranslateMessage(ctypes.byref(msg))
+                _user32.DispatchMessageW(ctypes.byref(msg))
+        except Exception as e:
+            logger.error(f"前台窗口事件钩子线程异常: {e}")
+        finally:
+            ContextMonitor._foreground_hook = None
+            if hook:
+                _user32.UnhookWinEvent(hook)
+            ready.set()
+
+    @staticmethod
+    def _on_foreground_changed(hWinEventHook, event, hwnd, idObject, idChild, dwEventThread, dwmsEventTime):
+        """EVENT_SYSTEM_FOREGROUND 回调：解析新前台窗口的进程名并写入缓存"""
+        try:
+            ContextMonitor._refresh_cache(hwnd)
+        except Exception as e:
+            logger.warning(f"解析前台窗口进程名失败: {e}")
+
+    @staticmethod
+    def _refresh_cache(hwnd=None) -> Dict[str, Any]:
+        """获取窗口快照并解析进程名，结果整体写入缓存
+
+        Args:
+            hwnd: 窗口句柄，None 表示当前前台窗口
+
+        Returns:
+            dict: 新的缓存内容
+        """
+        # 快照与写入在同一锁内完成，避免较早的快照覆盖钩子写入的新结果
+        with _state.lock:
+            if hwnd is None:
+                hwnd = _user32.GetForegroundWindow()
+            try:
+                snapshot = _snapshot_window(hwnd)
+            except Exception as e:
+                logger.warning(f"获取窗口信息失败: {e}")
+                snapshot = (0, 0, "", None)
+            cache = {
+                'snapshot': snapshot,
+                'process_name': ContextMonitor._resolve_process_name(snapshot),
+                'timestamp': time.monotonic_ns()
+            }
+            _state.cache = cache
+        return cache
+
+    @staticmethod
+    def _get_snapshot() -> Tuple[int, int, str, Optional[str]]:
+        """获取前台窗口快照，超时内直接返回缓存
+
+        窗口标题可能在前台窗口不变时变化，因此即使钩子工作也按超时刷新。
+        """
+        cache = _state.cache
+        if 'snapshot' in cache and time.monotonic_ns() - cache['timestamp'] < ContextMonitor._cache_timeout:
+            return cache['snapshot']
+        return ContextMonitor._refresh_cache()['snapshot']
+
+    @staticmethod
+    def _resolve_process_name(snapshot: Tuple[int, int, str, Optional[str]]) -> str:
+        """根据窗口快照解析进程名（未应用进程映射）
+
+        Args:
+            snapshot: _snapshot_window 返回的 (hwnd, pid, 标题, 进程名)
+
+        Returns:
+            str: 进程名（小写），无法识别时返回 'default'
+        """
+        _, pid, title, name = snapshot
+        raw_name = name or "default"
+            
+        # 如果无法通过进程直接识别，使用窗口标题进行启发式判断
+        if raw_name == "default" and title:
+            for match in _TITLE_RE.finditer(title):
+                if match.group()[0] in 'cC':
+                    # CASS 作为 AutoCAD 插件较常见，若标题包含 CASS，则优先归类为 cass
+                    raw_name = "cass.exe"
+                    break
+                raw_name = "acad.exe"
+        
+        # 排除工具自身进程（前台为Python宿主且PID为自身时）
+        if raw_name in _PYTHON_HOST_PROCESSES and pid == _SELF_PID:
+            raw_name = "default"
+        
+        return raw_name
+
     @staticmethod
     def get_current_process_name() -> str:
         """获取当前活动窗口的进程名
         
         返回小写的可执行文件名，如 'code.exe', 'explorer.exe' 等。
         对于无法识别的情况返回 'default'。
+        前台窗口事件钩子工作且进程名可直接获取时读取缓存，否则按超时定时查询。
         
         Returns:
             str: 进程名（小写），失败时返回 'default'
         """
-        current_time = time.time()
-        
-        # 检查缓存
-        if ('process_name' in ContextMonitor._cache and 
-            current_time - ContextMonitor._cache.get('timestamp', 0) < ContextMonitor._cache_timeout):
-            return ContextMonitor._cache['process_name']
-        
-        result = "default"
-        raw_name = "default"
-        
-        try:
-            hwnd = win32gui.GetForegroundWindow()
-            if hwnd:
-                _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                if pid and psutil.pid_exists(pid):
-                    process = psutil.Process(pid)
-                    raw_name = process.name().lower()
-        except Exception as e:
-            logger.warning(f"获取进程名失败: {e}")
-            raw_name = "default"
-            
-        # 如果无法通过进程直接识别，使用窗口标题进行启发式判断
-        if raw_name == "default":
-            try:
-                title = ContextMonitor.get_current_window_title().lower()
-                if title:
-                    if ("autocad" in title or "zwcad" in title or "gstarcad" in title or " cad" in title):
-                        raw_name = "acad.exe"
-                    if "cass" in title:
-                        # CASS 作为 AutoCAD 插件较常见，若标题包含 CASS，则优先归类为 cass
-                        raw_name = "cass.exe"
-            except Exception:
-                pass
+        cache = _state.cache
         
-        # 排除工具自身进程和相关Python进程（若误判为自身）
-        excluded_processes = {
-            "python.exe", "pythonw.exe", "py.exe", "pyw.exe",
-            "python", "py", "python3", "python3.exe"
-        }
-        if raw_name in excluded_processes:
-            try:
-                import os
-                hwnd = win32gui.GetForegroundWindow()
-                _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                if pid == os.getpid():
-                    raw_name = "default"
-            except Exception:
-                raw_name = "default"
+        # 检查缓存：钩子工作时缓存由前台切换事件刷新，不设超时；
+        # 但进程名无法获取、需要按窗口标题判断时，同一窗口的标题可能在不切换前台的
+        # 情况下变化（如打开了另一个图纸），此时仍按超时重新读取标题
+        if 'process_name' in cache and (
+                (ContextMonitor._foreground_hook is not None and cache['snapshot'][3] is not None) or
+                time.monotonic_ns() - cache['timestamp'] < ContextMonitor._cache_timeout):
+            raw_name = cache['process_name']
+        else:
+            raw_name = ContextMonitor._refresh_cache()['process_name']
         
         # 应用进程映射
         mappings = ContextMonitor._load_process_mappings()
         mapped_result = mappings.get(raw_name, raw_name)
         
-        # 更新缓存
-        ContextMonitor._cache = {
-            'process_name': mapped_result,
-            'timestamp': current_time
-        }
-        
         logger.debug(f"进程名映射: {raw_name} → {mapped_result}")
         return mapped_result
 
@@ -206,23 +670,23 @@ class ContextMonitor:
             str: 窗口标题，失败时返回空字符串
         """
         try:
-            hwnd = win32gui.GetForegroundWindow()
-            if not hwnd:
-                return ""
-            return win32gui.GetWindowText(hwnd)
+            return ContextMonitor._get_snapshot()[2]
         except Exception as e:
             logger.warning(f"获取窗口标题失败: {e}")
             return ""
 
     @staticmethod
-    def get_current_window_info() -> Dict[str, Any]:
+    def get_current_window_info(include_exe_path: bool = False) -> Dict[str, Any]:
         """获取当前活动窗口的详细信息
         
+        Args:
+            include_exe_path: 是否查询可执行文件完整路径（需额外打开进程句柄）
+        
         Returns:
             dict: 包含进程名、窗口标题、PID等信息的字典
         """
         try:
-            hwnd = win32gui.GetForegroundWindow()
+            hwnd, pid, window_title, process_name = ContextMonitor._get_snapshot()
             if not hwnd:
                 return {
                     "process_name": "default", 
@@ -231,10 +695,7 @@ class ContextMonitor:
                     "hwnd": 0
                 }
 
-            window_title = win32gui.GetWindowText(hwnd)
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            
-            if not pid or not psutil.pid_exists(pid):
+            if process_name is None:
                 return {
                     "process_name": "default", 
                     "window_title": window_title,
@@ -242,16 +703,16 @@ class ContextMonitor:
                     "hwnd": hwnd
                 }
 
-            process = psutil.Process(pid)
-            process_name = process.name().lower()
-
-            return {
+            info = {
                 "process_name": process_name,
                 "window_title": window_title,
                 "pid": pid,
-                "hwnd": hwnd,
-                "exe_path": process.exe() if hasattr(process, 'exe') else ""
+                "hwnd": hwnd
             }
+            if include_exe_path:
+                import psutil
+                info["exe_path"] = psutil.Process(pid).exe()
+            return info
         except Exception as e:
             logger.warning(f"获取窗口信息失败: {e}")
             return {
@@ -4,42 +4,238 @@
 """
 hotkey_listener.py
 
-基于 pywin32 的全局热键监听器，支持按下/松开事件的精确控制。
-使用 RegisterHotKey 和低级键盘钩子实现可靠的热键监听。
+全局热键监听器，支持按下/松开事件的精确控制。
+使用 RegisterHotKey 和 Raw Input 实现可靠的热键监听，Win32 调用均通过 ctypes
+完成（pywin32 只用于键码常量）。
 """
 
-import win32api
 import win32con
-import win32gui
 import threading
 import logging
 import ctypes
 import time
+from collections import deque
 from ctypes import wintypes
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QMetaObject, Qt, pyqtSignal, pyqtSlot
 
 logger = logging.getLogger(__name__)
 
-# 定义KBDLLHOOKSTRUCT结构体
-class KBDLLHOOKSTRUCT(ctypes.Structure):
+# 是否输出逐键调试日志，避免在每次按键时格式化字符串；在 start() 中刷新
+_DEBUG = logger.isEnabledFor(logging.DEBUG)
+
+# Raw Input 结构体（只注册键盘，RAWINPUT 的联合体只取 keyboard 成员）
+class RAWINPUTDEVICE(ctypes.Structure):
+    _fields_ = [
+        ("usUsagePage", wintypes.USHORT),
+        ("usUsage", wintypes.USHORT),
+        ("dwFlags", wintypes.DWORD),
+        ("hwndTarget", wintypes.HWND)
+    ]
+
+class RAWINPUTHEADER(ctypes.Structure):
+    _fields_ = [
+        ("dwType", wintypes.DWORD),
+        ("dwSize", wintypes.DWORD),
+        ("hDevice", wintypes.HANDLE),
+        ("wParam", wintypes.WPARAM)
+    ]
+
+class RAWKEYBOARD(ctypes.Structure):
     _fields_ = [
-        ("vkCode", wintypes.DWORD),
-        ("scanCode", wintypes.DWORD),
-        ("flags", wintypes.DWORD),
-        ("time", wintypes.DWORD),
-        ("dwExtraInfo", ctypes.POINTER(wintypes.ULONG))
+        ("MakeCode", wintypes.USHORT),
+        ("Flags", wintypes.USHORT),
+        ("Reserved", wintypes.USHORT),
+        ("VKey", wintypes.USHORT),
+        ("Message", wintypes.UINT),
+        ("ExtraInformation", wintypes.ULONG)
     ]
 
-# 定义回调函数类型
-HOOKPROC = ctypes.WINFUNCTYPE(ctypes.c_int, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+class RAWINPUT(ctypes.Structure):
+    _fields_ = [
+        ("header", RAWINPUTHEADER),
+        ("keyboard", RAWKEYBOARD)
+    ]
+
+# RegisterHotKey 相关常量
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_NOREPEAT = 0x4000
+WM_HOTKEY = 0x0312
+WM_TIMER = 0x0113
+WM_QUIT = 0x0012
+HWND_MESSAGE = -3
+
+# Raw Input 相关常量
+WM_INPUT = 0x00FF
+RIM_INPUT = 0
+RIM_TYPEKEYBOARD = 1
+RID_INPUT = 0x10000003
+RIDEV_REMOVE = 0x00000001
+RIDEV_INPUTSINK = 0x00000100
+RI_KEY_BREAK = 0x01
+RI_KEY_E0 = 0x02
+_RAW_INPUT_ERROR = 0xFFFFFFFF
+_SCAN_RSHIFT = 0x36
+
+# 按键事件队列容量；事件编码为 (vk << 1) | 是否按下，队列中 -1 表示停止
+_EVENT_QUEUE_SIZE = 512
+_EVENT_STOP = -1
+
+# GetMessageW 出错时日志的最小间隔（纳秒）
+_ERROR_LOG_INTERVAL_NS = 1_000_000_000
+
+# 热键按下后轮询按键释放的定时器
+_RELEASE_TIMER_ID = 1
+_RELEASE_POLL_MS = 15
+
+# 独立的 DLL 实例，argtypes 声明不影响其他模块
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+_user32.CreateWindowExW.argtypes = [
+    wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+    ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+    wintypes.HWND, wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID
+]
+_user32.CreateWindowExW.restype = wintypes.HWND
+_user32.DestroyWindow.argtypes = [wintypes.HWND]
+_user32.DestroyWindow.restype = wintypes.BOOL
+_user32.RegisterHotKey.argtypes = [wintypes.HWND, ctypes.c_int, wintypes.UINT, wintypes.UINT]
+_user32.RegisterHotKey.restype = wintypes.BOOL
+_user32.UnregisterHotKey.argtypes = [wintypes.HWND, ctypes.c_int]
+_user32.UnregisterHotKey.restype = wintypes.BOOL
+_user32.SetTimer.argtypes = [wintypes.HWND, ctypes.c_size_t, wintypes.UINT, ctypes.c_void_p]
+_user32.SetTimer.restype = ctypes.c_size_t
+_user32.KillTimer.argtypes = [wintypes.HWND, ctypes.c_size_t]
+_user32.KillTimer.restype = wintypes.BOOL
+_user32.GetAsyncKeyState.argtypes = [ctypes.c_int]
+_user32.GetAsyncKeyState.restype = ctypes.c_short
+_user32.GetMessageW.argtypes = [ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT]
+_user32.GetMessageW.restype = wintypes.BOOL
+_user32.WaitMessage.argtypes = []
+_user32.WaitMessage.restype = wintypes.BOOL
+_user32.PostThreadMessageW.argtypes = [wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+_user32.PostThreadMessageW.restype = wintypes.BOOL
+_user32.DefWindowProcW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+_user32.DefWindowProcW.restype = wintypes.LPARAM
+_user32.RegisterRawInputDevices.argtypes = [ctypes.POINTER(RAWINPUTDEVICE), wintypes.UINT, wintypes.UINT]
+_user32.RegisterRawInputDevices.restype = wintypes.BOOL
+_user32.GetRawInputData.argtypes = [
+    wintypes.HANDLE, wintypes.UINT, wintypes.LPVOID, ctypes.POINTER(wintypes.UINT), wintypes.UINT
+]
+_user32.GetRawInputData.restype = wintypes.UINT
+_kernel32.GetCurrentThreadId.restype = wintypes.DWORD
+
+# 消息循环中每条消息都会调用的函数，预先绑定避免重复属性查找。
+# ctypes 在外部调用期间释放 GIL，监听线程阻塞在 GetMessageW 时不影响 Qt 主线程
+_GetMessageW = _user32.GetMessageW
+_WaitMessage = _user32.WaitMessage
+_GetRawInputData = _user32.GetRawInputData
+_DefWindowProcW = _user32.DefWindowProcW
+_GetAsyncKeyState = _user32.GetAsyncKeyState
+
+# 热路径用到的虚拟键码
+_VK_CONTROL = win32con.VK_CONTROL
+_VK_SHIFT = win32con.VK_SHIFT
+_VK_MENU = win32con.VK_MENU
+_VK_LCONTROL = win32con.VK_LCONTROL
+_VK_RCONTROL = win32con.VK_RCONTROL
+_VK_LSHIFT = win32con.VK_LSHIFT
+_VK_RSHIFT = win32con.VK_RSHIFT
+_VK_LMENU = win32con.VK_LMENU
+_VK_RMENU = win32con.VK_RMENU
+
+# 修饰键的左右键码
+_CTRL_VKS = frozenset((win32con.VK_LCONTROL, win32con.VK_RCONTROL))
+_SHIFT_VKS = frozenset((win32con.VK_LSHIFT, win32con.VK_RSHIFT))
+_ALT_VKS = frozenset((win32con.VK_LMENU, win32con.VK_RMENU))
+
+# 热键所需修饰键的掩码位
+_MOD_SHIFT = 0x01
+_MOD_CTRL = 0x04
+_MOD_ALT = 0x10
+
+
+# 主键名称到虚拟键码的映射
+_KEY_MAPPING = {
+    # 功能键
+    'f1': win32con.VK_F1, 'f2': win32con.VK_F2, 'f3': win32con.VK_F3,
+    'f4': win32con.VK_F4, 'f5': win32con.VK_F5, 'f6': win32con.VK_F6,
+    'f7': win32con.VK_F7, 'f8': win32con.VK_F8, 'f9': win32con.VK_F9,
+    'f10': win32con.VK_F10, 'f11': win32con.VK_F11, 'f12': win32con.VK_F12,
+    # 数字键
+    '0': 0x30, '1': 0x31, '2': 0x32, '3': 0x33, '4': 0x34,
+    '5': 0x35, '6': 0x36, '7': 0x37, '8': 0x38, '9': 0x39,
+    # 小键盘数字
+    'num0': win32con.VK_NUMPAD0, 'num1': win32con.VK_NUMPAD1, 'num2': win32con.VK_NUMPAD2,
+    'num3': win32con.VK_NUMPAD3, 'num4': win32con.VK_NUMPAD4, 'num5': win32con.VK_NUMPAD5,
+    'num6': win32con.VK_NUMPAD6, 'num7': win32con.VK_NUMPAD7, 'num8': win32con.VK_NUMPAD8,
+    'num9': win32con.VK_NUMPAD9,
+    # 方向键
+    'up': win32con.VK_UP, 'down': win32con.VK_DOWN, 'left': win32con.VK_LEFT, 'right': win32con.VK_RIGHT,
+    # 特殊键
+    'space': win32con.VK_SPACE, 'tab': win32con.VK_TAB, 'enter': win32con.VK_RETURN,
+    'esc': win32con.VK_ESCAPE, 'backspace': win32con.VK_BACK, 'delete': win32con.VK_DELETE,
+    'home': win32con.VK_HOME, 'end': win32con.VK_END, 'pageup': win32con.VK_PRIOR,
+    'pagedown': win32con.VK_NEXT, 'insert': win32con.VK_INSERT,
+    # 标点符号
+    ';': 0xBA, '=': 0xBB, ',': 0xBC, '-': 0xBD, '.': 0xBE, '/': 0xBF,
+    '`': 0xC0, '[': 0xDB, '\\': 0xDC, ']': 0xDD, "'": 0xDE
+}
+_LETTER_VK = {c.lower(): ord(c) for c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'}
+
+
+def _resolve_key_vk(key_name):
+    """将主键名称解析为虚拟键码，无法识别时返回 None"""
+    key_name = key_name.lower()
+    return _KEY_MAPPING.get(key_name) or _LETTER_VK.get(key_name)
+
+
+def _compile_hotkey_matcher(required_mods, main_vk):
+    """按热键配置生成专用的匹配函数
+    
+    配置只在修改热键时变化，因此把所需条件直接展开成一个 lambda，
+    匹配时不再逐项判断配置。源码中只会拼入整数常量。
+    
+    Args:
+        required_mods: 所需修饰键掩码（_MOD_CTRL/_MOD_SHIFT/_MOD_ALT 组合）
+        main_vk: 主键虚拟键码，None 表示无法识别
+        
+    Returns:
+        callable: 接收按键位图、返回是否匹配的函数
+    """
+    if main_vk is None:
+        return lambda keybits: False
+    # 先检查位图中的主键，修饰键只在主键按下时才探测
+    conditions = [f"keybits[{main_vk >> 3}] & {1 << (main_vk & 7)} != 0"]
+    for mod, vk in ((_MOD_CTRL, _VK_CONTROL), (_MOD_SHIFT, _VK_SHIFT), (_MOD_ALT, _VK_MENU)):
+        if required_mods & mod:
+            conditions.append(f"_GetAsyncKeyState({vk}) & 0x8000 != 0")
+    source = "lambda keybits: " + " and ".join(conditions)
+    return eval(source, {"__builtins__": {}, "_GetAsyncKeyState": _GetAsyncKeyState})
+
+
+def _normalize_raw_vk(vkey, make_code, flags):
+    """将 Raw Input 上报的通用修饰键码转换为左右区分的键码
+    
+    Raw Input 对 Ctrl/Shift/Alt 只上报 VK_CONTROL/VK_SHIFT/VK_MENU，
+    需要结合扫描码和 E0 标志区分左右键。
+    """
+    if vkey == _VK_CONTROL:
+        return _VK_RCONTROL if flags & RI_KEY_E0 else _VK_LCONTROL
+    if vkey == _VK_MENU:
+        return _VK_RMENU if flags & RI_KEY_E0 else _VK_LMENU
+    if vkey == _VK_SHIFT:
+        return _VK_RSHIFT if make_code == _SCAN_RSHIFT else _VK_LSHIFT
+    return vkey
 
-# 全局实例引用
-_global_listener_instance = None
 
 class HotkeyListener(QObject):
     """全局热键监听器
     
-    使用 pywin32 实现可靠的热键监听，支持：
+    优先使用 RegisterHotKey 注册热键，系统只在组合键按下时唤醒监听线程；
+    热键被其他程序占用时回退到 Raw Input 监听键盘。支持：
     - 按下显示，松开隐藏的交互模式
     - 热键冲突检测
     - 线程安全的启动/停止
@@ -50,34 +246,39 @@ class HotkeyListener(QObject):
 
     def __init__(self, hotkey_config=None):
         super().__init__()
-        global _global_listener_instance
-        _global_listener_instance = self
         
         self.hotkey_config = hotkey_config or {'ctrl': True, 'shift': True, 'alt': False, 'key': 'f12'}
         self.hotkey_id = 1
         self.is_running = False
         self.hook_thread = None
-        self.hook_id = None
-        self.pressed_keys = set()
+        self._thread_id = None
+        # 保护 _thread_id 的发布与清除，避免向已退出（线程 ID 可能被复用）的线程投递消息
+        self._thread_lock = threading.Lock()
+        self._keybits = bytearray(32)  # 当前按下的键，按虚拟键码置位
         self.hotkey_active = False  # 防止重复触发的状态标记
-        self.last_hotkey_time = 0  # 上次热键触发时间
-        self.debounce_interval = 0.05  # 防抖动间隔（秒）
-        # 创建回调函数实例 - 使用静态方法避免self参数问题
-        self._hook_callback = HOOKPROC(self._static_keyboard_proc)
+        self._last_release_ns = 0  # 上次热键释放时间（单调时钟，纳秒）
+        self._debounce_ns = 50_000_000  # 释放后的防抖动间隔（纳秒）
+        self._last_error_log_ns = 0  # 上次记录消息循环错误的时间
+        # Raw Input 模式下消息循环只负责解码入队，匹配和发信号在工作线程中完成
+        self._event_q = deque(maxlen=_EVENT_QUEUE_SIZE)
+        self._event_wake = threading.Event()
+        self._update_hotkey_masks()
 
     def start(self):
         """启动热键监听"""
+        global _DEBUG
         if self.is_running:
             return True
+        _DEBUG = logger.isEnabledFor(logging.DEBUG)
             
         try:
-            # 启动低级键盘钩子线程
-            self.hook_thread = threading.Thread(target=self._hook_proc, daemon=True)
-            self.hook_thread.start()
             self.is_running = True
+            self.hook_thread = threading.Thread(target=self._listener_thread_proc, daemon=True)
+            self.hook_thread.start()
             logger.info("热键监听器启动成功")
             return True
         except Exception as e:
+            self.is_running = False
             logger.error(f"启动热键监听器失败: {e}")
             return False
 
@@ -88,9 +289,13 @@ class HotkeyListener(QObject):
             
         try:
             self.is_running = False
-            if self.hook_id:
-                ctypes.windll.user32.UnhookWindowsHookEx(self.hook_id)
-                self.hook_id = None
+            # 唤醒监听线程的消息循环，使其注销热键并退出
+            with self._thread_lock:
+                if self._thread_id:
+                    _user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            # 等待线程退出，保证重新启动前旧热键已注销
+            if self.hook_thread and self.hook_thread is not threading.current_thread():
+                self.hook_thread.join(1.0)
             logger.info("热键监听器已停止")
         except Exception as e:
             logger.error(f"停止热键监听器失败: {e}")
@@ -105,6 +310,7 @@ class HotkeyListener(QObject):
             bool: 注册是否成功
         """
         self.hotkey_config = hotkey_config
+        self._update_hotkey_masks()
         return True
         
     def unregister_hotkey(self):
@@ -114,273 +320,292 @@ class HotkeyListener(QObject):
     def update_hotkey_config(self, new_config):
         """更新热键配置"""
         self.hotkey_config = new_config
+        self._update_hotkey_masks()
         # 如果正在运行，重启监听器
         if self.is_running:
             self.stop()
             self.start()
 
-    def _hook_proc(self):
-        """键盘钩子处理线程"""
+    def _update_hotkey_masks(self):
+        """根据热键配置预先计算修饰键掩码和主键键码，按键时只需整数比较"""
+        required = 0
+        vk_set = set()
+        if self.hotkey_config.get('ctrl'):
+            required |= _MOD_CTRL
+            vk_set |= _CTRL_VKS
+        if self.hotkey_config.get('shift'):
+            required |= _MOD_SHIFT
+            vk_set |= _SHIFT_VKS
+        if self.hotkey_config.get('alt'):
+            required |= _MOD_ALT
+            vk_set |= _ALT_VKS
+        self._required_mods_mask = required
+        self._main_vk = _resolve_key_vk(self.hotkey_config.get('key', 'f12'))
+        if self._main_vk is not None:
+            vk_set.add(self._main_vk)
+        # 热键涉及的全部键码，与之无关的按键不会改变匹配结果
+        self._hotkey_vk_set = frozenset(vk_set)
+        self._match = _compile_hotkey_matcher(required, self._main_vk)
+
+    def _get_register_params(self):
+        """计算 RegisterHotKey 所需的修饰键标志和主键虚拟键码
+        
+        Returns:
+            tuple: (修饰键标志, 主键虚拟键码)，无法识别主键时键码为 None
+        """
+        mods = MOD_NOREPEAT
+        if self.hotkey_config.get('ctrl'):
+            mods |= MOD_CONTROL
+        if self.hotkey_config.get('shift'):
+            mods |= MOD_SHIFT
+        if self.hotkey_config.get('alt'):
+            mods |= MOD_ALT
+        return mods, self._main_vk
+
+    def _listener_thread_proc(self):
+        """监听线程：优先注册系统热键，失败时回退到 Raw Input"""
+        mods, vk = self._get_register_params()
+        hwnd = None
+        registered = False
         try:
-            # 安装低级键盘钩子
-            self.hook_id = ctypes.windll.user32.SetWindowsHookExW(
-                win32con.WH_KEYBOARD_LL,
-                self._hook_callback,
-                0,  # 对于低级钩子，可以使用0
-                0
-            )
-            
-            if not self.hook_id:
-                logger.error("安装键盘钩子失败")
+            # 仅用于接收 WM_HOTKEY / WM_INPUT 的消息窗口
+            hwnd = _user32.CreateWindowExW(0, "STATIC", None, 0, 0, 0, 0, 0,
+                                           HWND_MESSAGE, None, None, None)
+            if not hwnd:
+                logger.error(f"创建消息窗口失败: {ctypes.get_last_error()}")
                 return
-                
-            # 消息循环
-            while self.is_running:
-                try:
-                    msg = win32gui.GetMessage(None, 0, 0)
-                    if msg[1] == win32con.WM_QUIT:
-                        break
-                    win32gui.TranslateMessage(msg)
-                    win32gui.DispatchMessage(msg)
-                except:
-                    if not self.is_running:
-                        break
-                        
+            if vk is not None:
+                registered = bool(_user32.RegisterHotKey(hwnd, self.hotkey_id, mods, vk))
+            # 线程已有消息队列，stop() 可通过 PostThreadMessageW 唤醒
+            with self._thread_lock:
+                self._thread_id = _kernel32.GetCurrentThreadId()
+                if not self.is_running:
+                    self._thread_id = None
+                    return
+            
+            if registered:
+                logger.info("已通过 RegisterHotKey 注册全局热键")
+                self._hotkey_message_loop(hwnd, mods, vk)
+            else:
+                logger.warning(f"RegisterHotKey 注册失败（可能已被其他程序占用），回退到 Raw Input: {ctypes.get_last_error()}")
+                self._raw_input_loop(hwnd)
         except Exception as e:
-            logger.error(f"键盘钩子线程异常: {e}")
+            logger.error(f"热键监听线程异常: {e}")
         finally:
-            if self.hook_id:
-                ctypes.windll.user32.UnhookWindowsHookEx(self.hook_id)
-                self.hook_id = None
-
-    @staticmethod
-    def _static_keyboard_proc(nCode, wParam, lParam):
-        """静态键盘钩子处理函数"""
-        global _global_listener_instance
-        if _global_listener_instance and nCode >= 0:
-            try:
-                if wParam == win32con.WM_KEYDOWN or wParam == win32con.WM_SYSKEYDOWN:
-                    # lParam是指向KBDLLHOOKSTRUCT的指针
-                    kbd_struct = ctypes.cast(lParam, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
-                    vk_code = kbd_struct.vkCode
-                    _global_listener_instance._on_key_down(vk_code)
-                elif wParam == win32con.WM_KEYUP or wParam == win32con.WM_SYSKEYUP:
-                    kbd_struct = ctypes.cast(lParam, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
-                    vk_code = kbd_struct.vkCode
-                    _global_listener_instance._on_key_up(vk_code)
-            except Exception as e:
-                logger.error(f"键盘钩子处理异常: {e}")
-                
-        # 确保参数类型正确
-        return ctypes.windll.user32.CallNextHookEx(
-            ctypes.c_void_p(0),  # hhk
-            ctypes.c_int(nCode),  # nCode
-            ctypes.wintypes.WPARAM(wParam),  # wParam
-            ctypes.wintypes.LPARAM(lParam)   # lParam
-        )
+            with self._thread_lock:
+                self._thread_id = None
+            # 热键和消息窗口只能由创建它们的线程释放
+            if registered:
+                _user32.UnregisterHotKey(hwnd, self.hotkey_id)
+            if hwnd:
+                _user32.DestroyWindow(hwnd)
+
+    def _hotkey_message_loop(self, hwnd, mods, vk):
+        """RegisterHotKey 模式的消息循环
+        
+        收到 WM_HOTKEY 时发送按下信号，并启动短周期定时器轮询
+        GetAsyncKeyState，任一热键按键松开时发送释放信号并停止轮询。
+        """
+        release_vks = [vk]
+        if mods & MOD_CONTROL:
+            release_vks.append(_VK_CONTROL)
+        if mods & MOD_SHIFT:
+            release_vks.append(_VK_SHIFT)
+        if mods & MOD_ALT:
+            release_vks.append(_VK_MENU)
+        release_vks = tuple(release_vks)
+        
+        def any_released():
+            # 定时器每次触发都会调用，按键码元组绑定在闭包中
+            for key in release_vks:
+                if not _GetAsyncKeyState(key) & 0x8000:
+                    return True
+            return False
+        
+        hotkey_id = self.hotkey_id
+        # 复用同一个 MSG 结构体，不再为每条消息构造 Python 元组
+        msg = wintypes.MSG()
+        msg_ref = ctypes.byref(msg)
+        while self.is_running:
+            rc = _GetMessageW(msg_ref, None, 0, 0)
+            if rc == 0:
+                # 收到 WM_QUIT
+                break
+            if rc == -1:
+                self._on_message_error()
+                continue
+            message, wparam = msg.message, msg.wParam
+            if message == WM_HOTKEY and wparam == hotkey_id:
+                if self.hotkey_active:
+                    continue
+                # 松开后短时间内的再次按下视为按键抖动
+                if time.monotonic_ns() - self._last_release_ns < self._debounce_ns:
+                    continue
+                self.hotkey_active = True
+                logger.info("热键组合检测到，发送hotkey_pressed信号")
+                self._post_signal("_emit_pressed_slot")
+                _user32.SetTimer(hwnd, _RELEASE_TIMER_ID, _RELEASE_POLL_MS, None)
+            elif message == WM_TIMER and wparam == _RELEASE_TIMER_ID:
+                if any_released():
+                    _user32.KillTimer(hwnd, _RELEASE_TIMER_ID)
+                    self.hotkey_active = False
+                    self._last_release_ns = time.monotonic_ns()
+                    self._post_signal("_emit_released_slot")
+
+    def _raw_input_loop(self, hwnd):
+        """Raw Input 模式的消息循环（RegisterHotKey 不可用时的回退方案）
+        
+        以 RIDEV_INPUTSINK 注册键盘原始输入，按键事件经普通消息队列投递，
+        只观察不拦截，不会像低级键盘钩子那样阻塞其他程序的输入。
+        """
+        device = RAWINPUTDEVICE(0x01, 0x06, RIDEV_INPUTSINK, hwnd)
+        if not _user32.RegisterRawInputDevices(ctypes.byref(device), 1, ctypes.sizeof(device)):
+            logger.error(f"注册 Raw Input 设备失败: {ctypes.get_last_error()}")
+            return
         
-    def _low_level_keyboard_proc(self, nCode, wParam, lParam):
-        """低级键盘钩子处理函数"""
-        if nCode >= 0:
-            if wParam == win32con.WM_KEYDOWN or wParam == win32con.WM_SYSKEYDOWN:
-                # lParam是指向KBDLLHOOKSTRUCT的指针
-                vk_code = ctypes.cast(lParam, ctypes.POINTER(ctypes.c_ulong)).contents.value
-                self._on_key_down(vk_code)
-            elif wParam == win32con.WM_KEYUP or wParam == win32con.WM_SYSKEYUP:
-                vk_code = ctypes.cast(lParam, ctypes.POINTER(ctypes.c_ulong)).contents.value
-                self._on_key_up(vk_code)
+        # 缓冲区及其 byref 只创建一次，每条 WM_INPUT 复用
+        raw = RAWINPUT()
+        header = raw.header
+        # RAWKEYBOARD 前 8 字节依次为 MakeCode/Flags/Reserved/VKey，按一个整数整体读取
+        key_word = ctypes.c_uint64.from_buffer(raw, RAWINPUT.keyboard.offset)
+        raw_ref = ctypes.byref(raw)
+        raw_size = ctypes.sizeof(raw)
+        size = wintypes.UINT()
+        size_ref = ctypes.byref(size)
+        header_size = ctypes.sizeof(RAWINPUTHEADER)
+        msg = wintypes.MSG()
+        msg_ref = ctypes.byref(msg)
+        event_q = self._event_q
+        wake = self._event_wake
+        event_q.clear()
+        self._keybits[:] = bytes(len(self._keybits))
+        worker = threading.Thread(target=self._key_event_worker, daemon=True)
+        worker.start()
+        try:
+            while self.is_running:
+                rc = _GetMessageW(msg_ref, None, 0, 0)
+                if rc == 0:
+                    # 收到 WM_QUIT
+                    break
+                if rc == -1:
+                    self._on_message_error()
+                    continue
+                # 消息窗口只关心 WM_INPUT，无需 TranslateMessage/DispatchMessage
+                if msg.message != WM_INPUT:
+                    continue
+                
+                wparam, lparam = msg.wParam, msg.lParam
+                size.value = raw_size
+                result = _GetRawInputData(lparam, RID_INPUT, raw_ref, size_ref, header_size)
+                # 前台输入需要交给 DefWindowProc 做清理
+                if wparam == RIM_INPUT:
+                    _DefWindowProcW(hwnd, WM_INPUT, wparam, lparam)
+                if result == _RAW_INPUT_ERROR or header.dwType != RIM_TYPEKEYBOARD:
+                    continue
                 
-        return ctypes.windll.user32.CallNextHookEx(self.hook_id, nCode, wParam, lParam)
+                word = key_word.value
+                flags = (word >> 16) & 0xFFFF
+                vk_code = _normalize_raw_vk(word >> 48, word & 0xFFFF, flags)
+                event_q.append((vk_code << 1) | (not flags & RI_KEY_BREAK))
+                wake.set()
+        finally:
+            event_q.append(_EVENT_STOP)
+            wake.set()
+            worker.join(1.0)
+            device.dwFlags = RIDEV_REMOVE
+            device.hwndTarget = None
+            _user32.RegisterRawInputDevices(ctypes.byref(device), 1, ctypes.sizeof(device))
 
-    def _on_key_down(self, vk_code):
-        """按键按下处理"""
-        self.pressed_keys.add(vk_code)
-        logger.debug(f"按键按下: {vk_code}, 当前按下的键: {self.pressed_keys}")
+    def _on_message_error(self):
+        """GetMessageW 返回 -1 时的处理
         
-        # 检查热键状态
-        hotkey_matched = self._is_hotkey_pressed()
-        logger.debug(f"热键匹配检查: {hotkey_matched}, 配置: {self.hotkey_config}")
+        限频记录日志后阻塞到下一条消息到达，避免出错时在监听线程上空转。
+        """
+        error = ctypes.get_last_error()
+        now = time.monotonic_ns()
+        if now - self._last_error_log_ns >= _ERROR_LOG_INTERVAL_NS:
+            self._last_error_log_ns = now
+            logger.warning(f"GetMessageW 失败: {error}")
+        _WaitMessage()
+
+    def _key_event_worker(self):
+        """按键事件工作线程
         
-        if hotkey_matched:
-            # 只有在热键状态从未激活变为激活时才发送信号
-            if not self.hotkey_active:
-                current_time = time.time()
-                # 检查时间间隔，防止过于频繁的触发
-                if current_time - self.last_hotkey_time >= self.debounce_interval:
-                    self.hotkey_active = True
-                    self.last_hotkey_time = current_time
-                    logger.info(f"热键组合检测到，发送hotkey_pressed信号")
-                    self.hotkey_pressed.emit()
+        每次唤醒时一次性取空队列，只更新按键位图；全部事件应用完后
+        再做一次热键匹配，每批最多发送一个按下或释放信号。
+        """
+        event_q = self._event_q
+        wake = self._event_wake
+        keybits = self._keybits
+        update_state = self._update_hotkey_state
+        while True:
+            wake.wait()
+            wake.clear()
+            stopping = False
+            touched = False
+            hotkey_vks = self._hotkey_vk_set
+            while event_q:
+                event = event_q.popleft()
+                if event == _EVENT_STOP:
+                    stopping = True
+                    break
+                vk_code = event >> 1
+                if vk_code in hotkey_vks:
+                    touched = True
+                if event & 1:
+                    keybits[vk_code >> 3] |= 1 << (vk_code & 7)
                 else:
-                    logger.debug(f"防抖动阻止: 时间间隔 {current_time - self.last_hotkey_time:.3f}s < {self.debounce_interval}s")
-        else:
-            # 如果热键组合不完整，重置状态
-            self.hotkey_active = False
+                    keybits[vk_code >> 3] &= ~(1 << (vk_code & 7)) & 0xFF
+            if stopping:
+                return
+            # 本批事件都与热键无关时无需重新匹配
+            if not touched:
+                continue
+            try:
+                update_state()
+            except Exception as e:
+                logger.error(f"按键事件处理异常: {e}")
 
-    def _on_key_up(self, vk_code):
-        """按键释放处理"""
-        if vk_code in self.pressed_keys:
-            self.pressed_keys.remove(vk_code)
-            # 如果释放的是热键组合中的任一键，触发释放事件
-            if self._was_hotkey_key(vk_code):
-                # 重置热键激活状态
-                self.hotkey_active = False
-                self.hotkey_released.emit()
-
-    def _is_hotkey_pressed(self):
-        """检查当前是否按下了配置的热键组合"""
-        # 检查修饰键
-        ctrl_pressed = False
-        shift_pressed = False
-        alt_pressed = False
+    def _update_hotkey_state(self):
+        """根据当前按键位图更新热键状态，状态变化时发送信号"""
+        hotkey_matched = self._match(self._keybits)
+        if _DEBUG:
+            logger.debug(f"热键匹配: {hotkey_matched}")
+        if hotkey_matched == self.hotkey_active:
+            return
         
-        if self.hotkey_config.get('ctrl'):
-            ctrl_pressed = (win32con.VK_LCONTROL in self.pressed_keys or 
-                           win32con.VK_RCONTROL in self.pressed_keys)
-        else:
-            ctrl_pressed = True
-            
-        if self.hotkey_config.get('shift'):
-            shift_pressed = (win32con.VK_LSHIFT in self.pressed_keys or 
-                            win32con.VK_RSHIFT in self.pressed_keys)
-        else:
-            shift_pressed = True
-            
-        if self.hotkey_config.get('alt'):
-            alt_pressed = (win32con.VK_LMENU in self.pressed_keys or 
-                          win32con.VK_RMENU in self.pressed_keys)
+        if hotkey_matched:
+            # 首次匹配立即触发，只屏蔽松开后短时间内的抖动
+            elapsed_ns = time.monotonic_ns() - self._last_release_ns
+            if elapsed_ns >= self._debounce_ns:
+                self.hotkey_active = True
+                logger.info("热键组合检测到，发送hotkey_pressed信号")
+                self._post_signal("_emit_pressed_slot")
+            elif _DEBUG:
+                logger.debug(f"防抖动阻止: 距上次释放 {elapsed_ns / 1e6:.1f}ms")
         else:
-            alt_pressed = True
-            
-        # 检查主键
-        key_name = self.hotkey_config.get('key', 'f12').lower()
-        key_mapping = {
-            # 功能键
-            'f1': win32con.VK_F1, 'f2': win32con.VK_F2, 'f3': win32con.VK_F3,
-            'f4': win32con.VK_F4, 'f5': win32con.VK_F5, 'f6': win32con.VK_F6,
-            'f7': win32con.VK_F7, 'f8': win32con.VK_F8, 'f9': win32con.VK_F9,
-            'f10': win32con.VK_F10, 'f11': win32con.VK_F11, 'f12': win32con.VK_F12,
-            # 数字键
-            '0': 0x30, '1': 0x31, '2': 0x32, '3': 0x33, '4': 0x34,
-            '5': 0x35, '6': 0x36, '7': 0x37, '8': 0x38, '9': 0x39,
-            # 小键盘数字
-            'num0': win32con.VK_NUMPAD0, 'num1': win32con.VK_NUMPAD1, 'num2': win32con.VK_NUMPAD2,
-            'num3': win32con.VK_NUMPAD3, 'num4': win32con.VK_NUMPAD4, 'num5': win32con.VK_NUMPAD5,
-            'num6': win32con.VK_NUMPAD6, 'num7': win32con.VK_NUMPAD7, 'num8': win32con.VK_NUMPAD8,
-            'num9': win32con.VK_NUMPAD9,
-            # 方向键
-            'up': win32con.VK_UP, 'down': win32con.VK_DOWN, 'left': win32con.VK_LEFT, 'right': win32con.VK_RIGHT,
-            # 特殊键
-            'space': win32con.VK_SPACE, 'tab': win32con.VK_TAB, 'enter': win32con.VK_RETURN,
-            'esc': win32con.VK_ESCAPE, 'backspace': win32con.VK_BACK, 'delete': win32con.VK_DELETE,
-            'home': win32con.VK_HOME, 'end': win32con.VK_END, 'pageup': win32con.VK_PRIOR,
-            'pagedown': win32con.VK_NEXT, 'insert': win32con.VK_INSERT,
-            # 标点符号
-            ';': 0xBA, '=': 0xBB, ',': 0xBC, '-': 0xBD, '.': 0xBE, '/': 0xBF,
-            '`': 0xC0, '[': 0xDB, '\\': 0xDC, ']': 0xDD, "'": 0xDE
-        }
-        
-        main_key_pressed = False
-        if key_name in key_mapping:
-            main_key_pressed = key_mapping[key_name] in self.pressed_keys
-        elif len(key_name) == 1 and key_name.isalpha():
-            main_key_pressed = ord(key_name.upper()) in self.pressed_keys
-            
-        return ctrl_pressed and shift_pressed and alt_pressed and main_key_pressed
-        
-    def _was_hotkey_key(self, vk_code):
-        """检查释放的键是否是热键组合中的一个"""
-        # 检查是否是修饰键
-        if self.hotkey_config.get('ctrl') and vk_code in [win32con.VK_LCONTROL, win32con.VK_RCONTROL]:
-            return True
-        if self.hotkey_config.get('shift') and vk_code in [win32con.VK_LSHIFT, win32con.VK_RSHIFT]:
-            return True
-        if self.hotkey_config.get('alt') and vk_code in [win32con.VK_LMENU, win32con.VK_RMENU]:
-            return True
-            
-        # 检查是否是主键
-        key_name = self.hotkey_config.get('key', 'f12').lower()
-        key_mapping = {
-            # 功能键
-            'f1': win32con.VK_F1, 'f2': win32con.VK_F2, 'f3': win32con.VK_F3,
-            'f4': win32con.VK_F4, 'f5': win32con.VK_F5, 'f6': win32con.VK_F6,
-            'f7': win32con.VK_F7, 'f8': win32con.VK_F8, 'f9': win32con.VK_F9,
-            'f10': win32con.VK_F10, 'f11': win32con.VK_F11, 'f12': win32con.VK_F12,
-            # 数字键
-            '0': 0x30, '1': 0x31, '2': 0x32, '3': 0x33, '4': 0x34,
-            '5': 0x35, '6': 0x36, '7': 0x37, '8': 0x38, '9': 0x39,
-            # 小键盘数字
-            'num0': win32con.VK_NUMPAD0, 'num1': win32con.VK_NUMPAD1, 'num2': win32con.VK_NUMPAD2,
-            'num3': win32con.VK_NUMPAD3, 'num4': win32con.VK_NUMPAD4, 'num5': win32con.VK_NUMPAD5,
-            'num6': win32con.VK_NUMPAD6, 'num7': win32con.VK_NUMPAD7, 'num8': win32con.VK_NUMPAD8,
-            'num9': win32con.VK_NUMPAD9,
-            # 方向键
-            'up': win32con.VK_UP, 'down': win32con.VK_DOWN, 'left': win32con.VK_LEFT, 'right': win32con.VK_RIGHT,
-            # 特殊键
-            'space': win32con.VK_SPACE, 'tab': win32con.VK_TAB, 'enter': win32con.VK_RETURN,
-            'esc': win32con.VK_ESCAPE, 'backspace': win32con.VK_BACK, 'delete': win32con.VK_DELETE,
-            'home': win32con.VK_HOME, 'end': win32con.VK_END, 'pageup': win32con.VK_PRIOR,
-            'pagedown': win32con.VK_NEXT, 'insert': win32con.VK_INSERT,
-            # 标点符号
-            ';': 0xBA, '=': 0xBB, ',': 0xBC, '-': 0xBD, '.': 0xBE, '/': 0xBF,
-            '`': 0xC0, '[': 0xDB, '\\': 0xDC, ']': 0xDD, "'": 0xDE
-        }
-        
-        if key_name in key_mapping:
-            return vk_code == key_mapping[key_name]
-        elif len(key_name) == 1 and key_name.isalpha():
-            return vk_code == ord(key_name.upper())
-            
-        return False
+            # 热键组合中的任一键松开，触发释放事件
+            self.hotkey_active = False
+            self._last_release_ns = time.monotonic_ns()
+            self._post_signal("_emit_released_slot")
+
+    def _post_signal(self, slot_name):
+        """将信号发送排队到 Qt 主线程执行，监听线程只负责投递不等待"""
+        QMetaObject.invokeMethod(self, slot_name, Qt.ConnectionType.QueuedConnection)
+
+    @pyqtSlot()
+    def _emit_pressed_slot(self):
+        """在 Qt 主线程中发送按下信号"""
+        self.hotkey_pressed.emit()
+
+    @pyqtSlot()
+    def _emit_released_slot(self):
+        """在 Qt 主线程中发送释放信号"""
+        self.hotkey_released.emit()
 
     def _get_required_vk_codes(self):
         """获取配置热键对应的虚拟键码集合"""
-        vk_codes = set()
-        
-        if self.hotkey_config.get('ctrl'):
-            vk_codes.add(win32con.VK_LCONTROL)
-            vk_codes.add(win32con.VK_RCONTROL)
-        if self.hotkey_config.get('shift'):
-            vk_codes.add(win32con.VK_LSHIFT)
-            vk_codes.add(win32con.VK_RSHIFT)
-        if self.hotkey_config.get('alt'):
-            vk_codes.add(win32con.VK_LMENU)
-            vk_codes.add(win32con.VK_RMENU)
-            
-        # 主键映射
-        key_name = self.hotkey_config.get('key', 'f12').lower()
-        key_mapping = {
-            # 功能键
-            'f1': win32con.VK_F1, 'f2': win32con.VK_F2, 'f3': win32con.VK_F3,
-            'f4': win32con.VK_F4, 'f5': win32con.VK_F5, 'f6': win32con.VK_F6,
-            'f7': win32con.VK_F7, 'f8': win32con.VK_F8, 'f9': win32con.VK_F9,
-            'f10': win32con.VK_F10, 'f11': win32con.VK_F11, 'f12': win32con.VK_F12,
-            # 数字键
-            '0': 0x30, '1': 0x31, '2': 0x32, '3': 0x33, '4': 0x34,
-            '5': 0x35, '6': 0x36, '7': 0x37, '8': 0x38, '9': 0x39,
-            # 小键盘数字
-            'num0': win32con.VK_NUMPAD0, 'num1': win32con.VK_NUMPAD1, 'num2': win32con.VK_NUMPAD2,
-            'num3': win32con.VK_NUMPAD3, 'num4': win32con.VK_NUMPAD4, 'num5': win32con.VK_NUMPAD5,
-            'num6': win32con.VK_NUMPAD6, 'num7': win32con.VK_NUMPAD7, 'num8': win32con.VK_NUMPAD8,
-            'num9': win32con.VK_NUMPAD9,
-            # 方向键
-            'up': win32con.VK_UP, 'down': win32con.VK_DOWN, 'left': win32con.VK_LEFT, 'right': win32con.VK_RIGHT,
-            # 特殊键
-            'space': win32con.VK_SPACE, 'tab': win32con.VK_TAB, 'enter': win32con.VK_RETURN,
-            'esc': win32con.VK_ESCAPE, 'backspace': win32con.VK_BACK, 'delete': win32con.VK_DELETE,
-            'home': win32con.VK_HOME, 'end': win32con.VK_END, 'pageup': win32con.VK_PRIOR,
-            'pagedown': win32con.VK_NEXT, 'insert': win32con.VK_INSERT,
-            # 标点符号
-            ';': 0xBA, '=': 0xBB, ',': 0xBC, '-': 0xBD, '.': 0xBE, '/': 0xBF,
-            '`': 0xC0, '[': 0xDB, '\\': 0xDC, ']': 0xDD, "'": 0xDE
-        }
-        
-        if key_name in key_mapping:
-            vk_codes.add(key_mapping[key_name])
-        elif len(key_name) == 1 and key_name.isalpha():
-            vk_codes.add(ord(key_name.upper()))
-            
-        return vk_codes
+        return self._hotkey_vk_set
 
 
 # 测试代码
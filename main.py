@@ -6,360 +6,85 @@ main.py
 智能悬浮快捷键列表工具的主入口文件。
 """
 
-import sys, os, logging, json
+import sys, os, logging, queue, atexit, functools, time
+from logging.handlers import QueueHandler, QueueListener
 try:
     import win32api
     import win32event
     import winerror
 except ImportError:
     win32api = None
-from PyQt6.QtWidgets import (QApplication, QSystemTrayIcon, QMenu, QDialog,
-                             QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-                             QPushButton, QSlider, QColorDialog, QComboBox,
-                             QSpinBox, QMessageBox, QFileDialog, QGroupBox, QFormLayout,
-                             QListWidget, QInputDialog, QTabWidget, QWidget, QCheckBox)
-from PyQt6.QtCore import Qt, QSettings
-from PyQt6.QtGui import QIcon, QAction, QColor
+# 启动时只导入托盘所需的部件；设置对话框及各功能模块在首次使用时再导入
+from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QMessageBox
+from PyQt6.QtGui import QIcon, QAction
+from PyQt6.QtCore import QTimer
 
-from shortcut_manager import ShortcutManager
-from context_monitor import ContextMonitor
-from hotkey_listener import HotkeyListener
-from shortcut_window import ShortcutWindow
 from autostart_manager import AutostartManager
+from app_settings import settings
 
-# 统一日志配置
+# 统一日志配置：记录日志只入队，文件和控制台输出在后台线程完成，
+# 热键回调不会等待磁盘写入。设置环境变量 SHORTCUT_DEBUG 可开启调试日志
+_log_queue = queue.SimpleQueue()
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = (
+    logging.FileHandler('shortcut_tool.log', encoding='utf-8', delay=True),
+    logging.StreamHandler()
+)
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+# 入队一侧只保留原始消息，时间、级别等前缀统一由后台输出端的 _log_formatter 添加
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('shortcut_tool.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
+    level=logging.DEBUG if os.environ.get("SHORTCUT_DEBUG") else logging.INFO,
+    handlers=[_queue_handler]
 )
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
-class SettingsDialog(QDialog):
-    """简洁设置对话框"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("设置")
-        self.setFixedSize(500, 600)
-        self.settings = QSettings("ShortcutTool", "Settings")
-        self.process_mappings = {}
-        self.autostart_manager = AutostartManager()
-        self._load_process_mappings()
-        self._build_ui()
-        self._load()
+# QSettings 原始值到布尔值的映射，取代 value(..., type=bool) 的 QVariant 转换
+# True/False 与 1/0 哈希相同，布尔键同时覆盖整数 1 和 0
+_BOOL = {"true": True, "1": True, True: True,
+         "false": False, "0": False, False: False}
 
-    def _load_process_mappings(self):
-        """加载进程映射配置"""
-        try:
-            mapping_file = os.path.join(os.path.dirname(__file__), "process_mapping.json")
-            if os.path.exists(mapping_file):
-                with open(mapping_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.process_mappings = data.get("mappings", {})
-            else:
-                # 默认映射
-                self.process_mappings = {
-                    "chrome.exe": "chrome.exe",
-                    "firefox.exe": "firefox.exe",
-                    "msedge.exe": "chrome.exe",
-                    "code.exe": "code.exe",
-                    "notepad++.exe": "notepad++.exe",
-                    "explorer.exe": "explorer.exe"
-                }
-        except Exception as e:
-            logger.error(f"加载进程映射失败: {e}")
-            self.process_mappings = {}
+# 程序目录下的默认数据文件和图标路径（模块导入时计算一次）
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_DEFAULT_DATA_FILE = os.path.join(_MODULE_DIR, "shortcuts.json")
+_ICON_PATH = os.path.join(_MODULE_DIR, "icon.svg")
 
-    def _save_process_mappings(self):
-        """保存进程映射配置"""
-        try:
-            mapping_file = os.path.join(os.path.dirname(__file__), "process_mapping.json")
-            data = {
-                "mappings": self.process_mappings,
-                "description": "进程名映射配置文件，左侧为实际进程名，右侧为shortcuts.json中对应的配置键名"
-            }
-            with open(mapping_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            logger.info("进程映射配置已保存")
-        except Exception as e:
-            logger.error(f"保存进程映射失败: {e}")
-
-    def _build_ui(self):
-        layout = QVBoxLayout(self)
-        
-        # 创建选项卡
-        tab_widget = QTabWidget()
-        
-        # 基本设置选项卡
-        basic_tab = QWidget()
-        basic_layout = QVBoxLayout(basic_tab)
-        
-        # 热键
-        hotkey_box = QGroupBox("热键")
-        hotkey_layout = QHBoxLayout(hotkey_box)
-        self.ctrl_cb = QComboBox(); self.ctrl_cb.addItems(["Ctrl","无"])
-        self.shift_cb = QComboBox(); self.shift_cb.addItems(["Shift","无"])
-        self.alt_cb = QComboBox(); self.alt_cb.addItems(["Alt","无"])
-        self.key_cb = QComboBox()
-        # 添加所有支持的按键选项
-        key_options = (
-            # 功能键
-            [f"F{i}" for i in range(1, 13)] +
-            # 数字键
-            [str(i) for i in range(10)] +
-            # 字母键
-            [chr(i) for i in range(ord('A'), ord('Z') + 1)] +
-            # 小键盘
-            [f"Num{i}" for i in range(10)] +
-            # 方向键
-            ["Up", "Down", "Left", "Right"] +
-            # 特殊键
-            ["Space", "Tab", "Enter", "Esc", "Backspace", "Delete", 
-             "Home", "End", "PageUp", "PageDown", "Insert"] +
-            # 标点符号
-            [";", "=", ",", "-", ".", "/", "`", "[", "\\", "]", "'"]
-        )
-        self.key_cb.addItems(key_options)
-        for w in (QLabel("全局热键:"), self.ctrl_cb, self.shift_cb, self.alt_cb, self.key_cb):
-            hotkey_layout.addWidget(w)
-        basic_layout.addWidget(hotkey_box)
+# 连续按热键时复用进程名查询结果的有效期（纳秒）
+_PROC_CACHE_TTL_NS = 200_000_000
 
-        # 窗口
-        win_box = QGroupBox("窗口")
-        win_layout = QVBoxLayout(win_box)
-        opacity_layout = QHBoxLayout()
-        self.opacity_slider = QSlider(Qt.Orientation.Horizontal)
-        self.opacity_slider.setRange(50,100)
-        self.opacity_lbl = QLabel("90%")
-        self.opacity_slider.valueChanged.connect(lambda v: self.opacity_lbl.setText(f"{v}%"))
-        for w in (QLabel("透明度:"), self.opacity_slider, self.opacity_lbl):
-            opacity_layout.addWidget(w)
-        win_layout.addLayout(opacity_layout)
-
-        color_layout = QHBoxLayout()
-        self.bg_btn = QPushButton(); self.bg_btn.setFixedWidth(80); self.bg_btn.clicked.connect(lambda: self._pick_color(self.bg_btn))
-        color_layout.addWidget(QLabel("背景色:")); color_layout.addWidget(self.bg_btn)
-        win_layout.addLayout(color_layout)
-        basic_layout.addWidget(win_box)
-
-        # 字体
-        font_box = QGroupBox("字体")
-        font_layout = QFormLayout(font_box)
-        self.font_cb = QComboBox(); self.font_cb.addItems(["Microsoft YaHei","Arial","SimSun"])
-        self.size_spin = QSpinBox(); self.size_spin.setRange(8,20)
-        font_layout.addRow("字体:", self.font_cb)
-        font_layout.addRow("大小:", self.size_spin)
-        self.font_color_btn = QPushButton(); self.font_color_btn.setFixedWidth(80); self.font_color_btn.clicked.connect(lambda: self._pick_color(self.font_color_btn))
-        font_layout.addRow("文字色:", self.font_color_btn)
-        basic_layout.addWidget(font_box)
-
-        # 自启动设置
-        autostart_box = QGroupBox("自启动")
-        autostart_layout = QVBoxLayout(autostart_box)
-        self.autostart_cb = QCheckBox("开机自动启动")
-        self.autostart_cb.setToolTip("启用后，程序将在Windows启动时自动运行")
-        autostart_layout.addWidget(self.autostart_cb)
-        basic_layout.addWidget(autostart_box)
-
-        # 数据文件
-        data_box = QGroupBox("数据文件")
-        data_layout = QHBoxLayout(data_box)
-        self.data_edit = QLineEdit(); self.data_edit.setReadOnly(True)
-        browse_btn = QPushButton("浏览..."); browse_btn.clicked.connect(self._browse)
-        data_layout.addWidget(self.data_edit); data_layout.addWidget(browse_btn)
-        basic_layout.addWidget(data_box)
-        
-        # 添加基本设置选项卡
-        tab_widget.addTab(basic_tab, "基本设置")
-        
-        # 进程映射选项卡
-        process_tab = QWidget()
-        process_layout = QVBoxLayout(process_tab)
-        
-        # 进程映射说明
-        info_label = QLabel("配置进程名映射，将实际运行的进程名映射到shortcuts.json中的配置键名：")
-        info_label.setWordWrap(True)
-        process_layout.addWidget(info_label)
-        
-        # 进程映射列表
-        mapping_box = QGroupBox("进程映射")
-        mapping_layout = QVBoxLayout(mapping_box)
-        
-        self.mapping_list = QListWidget()
-        self._update_mapping_list()
-        mapping_layout.addWidget(self.mapping_list)
-        
-        # 按钮布局
-        btn_layout = QHBoxLayout()
-        add_btn = QPushButton("添加映射")
-        add_btn.clicked.connect(self._add_mapping)
-        edit_btn = QPushButton("编辑映射")
-        edit_btn.clicked.connect(self._edit_mapping)
-        del_btn = QPushButton("删除映射")
-        del_btn.clicked.connect(self._delete_mapping)
-        
-        btn_layout.addWidget(add_btn)
-        btn_layout.addWidget(edit_btn)
-        btn_layout.addWidget(del_btn)
-        btn_layout.addStretch()
-        mapping_layout.addLayout(btn_layout)
-        
-        process_layout.addWidget(mapping_box)
-        
-        # 添加进程映射选项卡
-        tab_widget.addTab(process_tab, "进程映射")
-        
-        # 将选项卡添加到主布局
-        layout.addWidget(tab_widget)
+# 启动后延迟开启快捷键文件监视的时间（毫秒）
+_WATCH_DELAY_MS = 3000
 
-        # 按钮
-        main_btn_layout = QHBoxLayout()
-        save_btn = QPushButton("保存"); save_btn.clicked.connect(self.accept)
-        cancel_btn = QPushButton("取消"); cancel_btn.clicked.connect(self.reject)
-        main_btn_layout.addStretch(); main_btn_layout.addWidget(save_btn); main_btn_layout.addWidget(cancel_btn)
-        layout.addLayout(main_btn_layout)
 
-    def _update_mapping_list(self):
-        """更新进程映射列表显示"""
-        self.mapping_list.clear()
-        for process_name, config_key in self.process_mappings.items():
-            item_text = f"{process_name} → {config_key}"
-            self.mapping_list.addItem(item_text)
-    
-    def _add_mapping(self):
-        """添加新的进程映射"""
-        process_name, ok1 = QInputDialog.getText(self, "添加进程映射", "请输入进程名称（如：chrome.exe）:")
-        if ok1 and process_name.strip():
-            process_name = process_name.strip().lower()
-            config_key, ok2 = QInputDialog.getText(self, "添加进程映射", "请输入对应的配置键名（如：chrome.exe）:")
-            if ok2 and config_key.strip():
-                config_key = config_key.strip()
-                self.process_mappings[process_name] = config_key
-                self._update_mapping_list()
-                logger.info(f"添加进程映射: {process_name} → {config_key}")
+@functools.lru_cache(maxsize=8)
+def _fmt_hotkey(ctrl, shift, alt, key):
+    """拼接热键文本，同一组合只拼接一次
     
-    def _edit_mapping(self):
-        """编辑选中的进程映射"""
-        current_item = self.mapping_list.currentItem()
-        if not current_item:
-            QMessageBox.warning(self, "警告", "请先选择要编辑的映射项")
-            return
-        
-        item_text = current_item.text()
-        try:
-            process_name, config_key = item_text.split(" → ")
-            
-            new_process_name, ok1 = QInputDialog.getText(self, "编辑进程映射", "进程名称:", text=process_name)
-            if ok1 and new_process_name.strip():
-                new_process_name = new_process_name.strip().lower()
-                new_config_key, ok2 = QInputDialog.getText(self, "编辑进程映射", "配置键名:", text=config_key)
-                if ok2 and new_config_key.strip():
-                    new_config_key = new_config_key.strip()
-                    
-                    # 删除旧映射
-                    if process_name in self.process_mappings:
-                        del self.process_mappings[process_name]
-                    
-                    # 添加新映射
-                    self.process_mappings[new_process_name] = new_config_key
-                    self._update_mapping_list()
-                    logger.info(f"编辑进程映射: {process_name} → {config_key} 改为 {new_process_name} → {new_config_key}")
-        except ValueError:
-            QMessageBox.warning(self, "错误", "无法解析选中的映射项")
-    
-    def _delete_mapping(self):
-        """删除选中的进程映射"""
-        current_item = self.mapping_list.currentItem()
-        if not current_item:
-            QMessageBox.warning(self, "警告", "请先选择要删除的映射项")
-            return
-        
-        item_text = current_item.text()
-        try:
-            process_name, config_key = item_text.split(" → ")
-            
-            reply = QMessageBox.question(self, "确认删除", f"确定要删除映射 '{process_name} → {config_key}' 吗？",
-                                       QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-            if reply == QMessageBox.StandardButton.Yes:
-                if process_name in self.process_mappings:
-                    del self.process_mappings[process_name]
-                    self._update_mapping_list()
-                    logger.info(f"删除进程映射: {process_name} → {config_key}")
-        except ValueError:
-            QMessageBox.warning(self, "错误", "无法解析选中的映射项")
-
-    def _pick_color(self, btn):
-        c = QColorDialog.getColor(QColor(btn.text()), self)
-        if c.isValid():
-            btn.setText(c.name()); btn.setStyleSheet(f"background:{c.name()}")
-
-    def _browse(self):
-        path, _ = QFileDialog.getOpenFileName(self, "选择快捷键数据文件", "", "JSON (*.json)")
-        if path: self.data_edit.setText(path)
-
-    def _load(self):
-        def set_combo(cb, val, default=True):
-            cb.setCurrentIndex(0 if val else 1)
-        set_combo(self.ctrl_cb, self.settings.value("hotkey/ctrl", True, bool))
-        set_combo(self.shift_cb, self.settings.value("hotkey/shift", True, bool))
-        set_combo(self.alt_cb, self.settings.value("hotkey/alt", False, bool))
-        key = self.settings.value("hotkey/key", "F1")
-        self.key_cb.setCurrentText(key)
-
-        self.opacity_slider.setValue(int(float(self.settings.value("window/opacity", 0.9))*100))
-        bg = self.settings.value("window/bg_color", "#2E2E2E")
-        self.bg_btn.setText(bg); self.bg_btn.setStyleSheet(f"background:{bg}")
-
-        font = self.settings.value("font/family", "Microsoft YaHei")
-        self.font_cb.setCurrentText(font)
-        self.size_spin.setValue(self.settings.value("font/size", 10, int))
-        fc = self.settings.value("font/color", "#FFFFFF")
-        self.font_color_btn.setText(fc); self.font_color_btn.setStyleSheet(f"background:{fc}")
-
-        data = self.settings.value("data/file_path", "")
-        if not data:
-            data = os.path.join(os.path.dirname(__file__), "shortcuts.json")
-        self.data_edit.setText(data)
-        
-        # 加载自启动状态
-        self.autostart_cb.setChecked(self.autostart_manager.is_autostart_enabled())
+    Args:
+        ctrl: 是否包含 Ctrl
+        shift: 是否包含 Shift
+        alt: 是否包含 Alt
+        key: 主键名称
+        
+    Returns:
+        str: 热键文本，例如 "Ctrl+F1"
+    """
+    parts = [m for m, on in (("Ctrl", ctrl), ("Shift", shift), ("Alt", alt)) if on]
+    parts.append(key)
+    return "+".join(parts)
 
-    def accept(self):
-        self.settings.setValue("hotkey/ctrl", self.ctrl_cb.currentText()=="Ctrl")
-        self.settings.setValue("hotkey/shift", self.shift_cb.currentText()=="Shift")
-        self.settings.setValue("hotkey/alt", self.alt_cb.currentText()=="Alt")
-        self.settings.setValue("hotkey/key", self.key_cb.currentText())
-        self.settings.setValue("window/opacity", self.opacity_slider.value()/100)
-        self.settings.setValue("window/bg_color", self.bg_btn.text())
-        self.settings.setValue("font/family", self.font_cb.currentText())
-        self.settings.setValue("font/size", self.size_spin.value())
-        self.settings.setValue("font/color", self.font_color_btn.text())
-        self.settings.setValue("data/file_path", self.data_edit.text())
-        
-        # 保存自启动设置
-        try:
-            if self.autostart_cb.isChecked():
-                if not self.autostart_manager.is_autostart_enabled():
-                    success = self.autostart_manager.enable_autostart()
-                    if not success:
-                        QMessageBox.warning(self, "警告", "启用开机自启动失败，可能需要管理员权限")
-            else:
-                if self.autostart_manager.is_autostart_enabled():
-                    success = self.autostart_manager.disable_autostart()
-                    if not success:
-                        QMessageBox.warning(self, "警告", "禁用开机自启动失败")
-        except Exception as e:
-            logger.error(f"保存自启动设置失败: {e}")
-            QMessageBox.warning(self, "错误", f"保存自启动设置失败: {str(e)}")
-        
-        # 保存进程映射配置
-        self._save_process_mappings()
-        
-        super().accept()
 
+def __getattr__(name):
+    """延迟导出 SettingsDialog，保持 ``from main import SettingsDialog`` 可用"""
+    if name == "SettingsDialog":
+        from settings_dialog import SettingsDialog
+        return SettingsDialog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class ShortcutTool:
@@ -385,7 +110,14 @@ class ShortcutTool:
         self.app.setQuitOnLastWindowClosed(False)  # 关闭窗口时不退出应用
         
         # 加载设置
-        self.settings = QSettings("ShortcutTool", "Settings")
+        self.settings = settings()
+        self._reload_cfg()
+        
+        # 设置对话框首次打开时创建，之后复用
+        self._settings_dialog = None
+        
+        # 最近一次查询到的 (进程名, 时间戳)
+        self._proc_cache = None
         
         # 初始化模块
         self.init_modules()
@@ -459,23 +191,97 @@ class ShortcutTool:
         # 创建系统托盘图标
         self.create_tray_icon()
     
+    def _reload_cfg(self):
+        """一次性读取全部设置到 self._cfg，其余代码只从字典取值
+
+        注册表中的值读回来都是字符串，这里统一转换类型、把空数据路径解析为默认路径，
+        _apply_cfg_changes 比较新旧配置时未改动的设置才不会被当成变化。
+        """
+        settings = self.settings
+        data_file = settings.value("data/file_path", "", type=str)
+        self._cfg = {
+            "hotkey/ctrl": _BOOL.get(settings.value("hotkey/ctrl", "true"), True),
+            "hotkey/shift": _BOOL.get(settings.value("hotkey/shift", "true"), True),
+            "hotkey/alt": _BOOL.get(settings.value("hotkey/alt", "false"), False),
+            "hotkey/key": settings.value("hotkey/key", "F1", type=str),
+            "window/opacity": settings.value("window/opacity", 0.9, type=float),
+            "window/bg_color": settings.value("window/bg_color", "#2E2E2E", type=str),
+            "font/family": settings.value("font/family", "Microsoft YaHei", type=str),
+            "font/size": settings.value("font/size", 10, type=int),
+            "font/color": settings.value("font/color", "#FFFFFF", type=str),
+            # 未设置时使用程序目录下的 shortcuts.json
+            "data/file_path": os.path.normpath(data_file) if data_file else _DEFAULT_DATA_FILE,
+        }
+
+    def _data_file(self):
+        """返回快捷键数据文件路径，未设置时为程序目录下的 shortcuts.json"""
+        return self._cfg["data/file_path"]
+
+    def _window_settings(self):
+        """从缓存配置生成 ShortcutWindow.update_settings 所需的字典"""
+        cfg = self._cfg
+        return {
+            "opacity": cfg["window/opacity"],
+            "bg_color": cfg["window/bg_color"],
+            "font_family": cfg["font/family"],
+            "font_size": cfg["font/size"],
+            "font_color": cfg["font/color"]
+        }
+
+    def _hotkey_config(self):
+        """从缓存配置生成 HotkeyListener 所需的热键配置"""
+        cfg = self._cfg
+        return {
+            "ctrl": cfg["hotkey/ctrl"],
+            "shift": cfg["hotkey/shift"],
+            "alt": cfg["hotkey/alt"],
+            "key": cfg["hotkey/key"].lower()
+        }
+
+    def _apply_cfg_changes(self, old_cfg):
+        """只把发生变化的设置应用到已有模块，不重建整个模块
+        
+        Args:
+            old_cfg: 重新读取设置之前的配置字典
+        """
+        cfg = self._cfg
+        changed = {k for k, v in cfg.items() if old_cfg.get(k) != v}
+        if not changed:
+            return
+        
+        try:
+            # 热键组合变化时才重启监听器
+            if any(k.startswith("hotkey/") for k in changed):
+                self.hotkey_listener.update_hotkey_config(self._hotkey_config())
+            
+            # 窗口和字体设置直接应用到现有窗口
+            if any(k.startswith(("window/", "font/")) for k in changed):
+                self.shortcut_window.update_settings(self._window_settings())
+            
+            # 数据文件变化时重新加载并监视新文件所在目录
+            if "data/file_path" in changed:
+                self.shortcut_manager.load(self._data_file())
+                self.shortcut_manager.watch_for_changes()
+            
+            logger.info("已应用设置变更: %s", ", ".join(sorted(changed)))
+        except Exception as e:
+            logger.error(f"应用设置变更失败: {e}")
+
     def init_modules(self):
         """
         初始化各个模块
         """
+        from shortcut_manager import ShortcutManager
+        from context_monitor import ContextMonitor
+        from hotkey_listener import HotkeyListener
+        from shortcut_window import ShortcutWindow
+        
         try:
-            # 获取数据文件路径
-            data_file = self.settings.value("data/file_path", "")
-            if not data_file:
-                # 使用默认路径
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                data_file = os.path.join(current_dir, "shortcuts.json")
-            
             # 创建快捷键管理器
-            self.shortcut_manager = ShortcutManager(data_file)
+            self.shortcut_manager = ShortcutManager(self._data_file())
             
-            # 启用文件监视（自动重载）
-            self.shortcut_manager.watch_for_changes()
+            # 启用文件监视（自动重载），推迟到启动完成后的空闲时间，不占用启动路径
+            QTimer.singleShot(_WATCH_DELAY_MS, self.shortcut_manager.watch_for_changes)
             
             # 初始化上下文监控器
             self.context_monitor = ContextMonitor()
@@ -484,22 +290,10 @@ class ShortcutTool:
             self.shortcut_window = ShortcutWindow(self.shortcut_manager)
             
             # 更新窗口设置
-            window_settings = {
-                "opacity": self.settings.value("window/opacity", 0.9),
-                "bg_color": self.settings.value("window/bg_color", "#2E2E2E"),
-                "font_family": self.settings.value("font/family", "Microsoft YaHei"),
-                "font_size": self.settings.value("font/size", 10),
-                "font_color": self.settings.value("font/color", "#FFFFFF")
-            }
-            self.shortcut_window.update_settings(window_settings)
+            self.shortcut_window.update_settings(self._window_settings())
             
             # 创建热键监听器
-            hotkey_config = {
-                "ctrl": self.settings.value("hotkey/ctrl", True, type=bool),
-                "shift": self.settings.value("hotkey/shift", True, type=bool),
-                "alt": self.settings.value("hotkey/alt", False, type=bool),
-                "key": self.settings.value("hotkey/key", "F1").lower()
-            }
+            hotkey_config = self._hotkey_config()
             
             self.hotkey_listener = HotkeyListener(hotkey_config)
             # 连接新的按下/松开信号
@@ -527,9 +321,11 @@ class ShortcutTool:
         self.tray_icon = QSystemTrayIcon(self.app)
         
         # 设置图标
-        icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon.svg")
-        if os.path.exists(icon_path):
-            self.tray_icon.setIcon(QIcon(icon_path))
+        icon_path = _ICON_PATH
+        # 直接加载图标，加载失败（含文件不存在）时 isNull() 为真，无需事先检查文件
+        icon = QIcon(icon_path)
+        if not icon.isNull():
+            self.tray_icon.setIcon(icon)
             logger.info(f"已加载图标文件: {icon_path}")
         else:
             logger.warning(f"找不到图标文件: {icon_path}，使用默认图标")
@@ -576,6 +372,20 @@ class ShortcutTool:
         self.tray_icon.show()
         logger.info("系统托盘图标已创建并显示")
     
+    def _get_proc_cached(self):
+        """获取当前活动窗口进程名，短时间内的重复查询直接返回上次结果
+        
+        Returns:
+            str: 映射后的进程名
+        """
+        now = time.monotonic_ns()
+        cached = self._proc_cache
+        if cached is not None and now - cached[1] < _PROC_CACHE_TTL_NS:
+            return cached[0]
+        name = self.context_monitor.get_current_process_name()
+        self._proc_cache = (name, now)
+        return name
+
     def on_hotkey_pressed(self):
         """
         热键按下时的回调函数
@@ -583,16 +393,16 @@ class ShortcutTool:
         try:
             logger.info("热键按下，正在获取当前活动窗口进程名")
             # 获取当前活动窗口的进程名
-            process_name = self.context_monitor.get_current_process_name()
-            logger.info(f"当前活动窗口进程名: {process_name}")
+            process_name = self._get_proc_cached()
+            logger.info("当前活动窗口进程名: %s", process_name)
             
             # 显示对应的快捷键列表
-            logger.info("正在显示快捷键列表")
-            self.shortcut_window.show_shortcuts(process_name)
-            logger.info(f"快捷键窗口显示状态: {self.shortcut_window.isVisible()}")
+            shown = self.shortcut_window.show_shortcuts(process_name)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("快捷键窗口显示状态: %s", shown)
             
-            # 检查窗口是否可见，如果不可见则尝试强制显示
-            if not self.shortcut_window.isVisible():
+            # 只有显示确实失败时才尝试强制显示
+            if not shown:
                 logger.warning("窗口不可见，尝试强制显示")
                 # 尝试多种方法强制显示窗口
                 self.shortcut_window.setWindowState(self.shortcut_window.windowState() & ~self.shortcut_window.WindowState.WindowMinimized)
@@ -600,9 +410,9 @@ class ShortcutTool:
                 self.shortcut_window.setVisible(True)
                 self.shortcut_window.activateWindow()
                 self.shortcut_window.raise_()
-                logger.info(f"强制显示后窗口可见状态: {self.shortcut_window.isVisible()}")
+                logger.info("强制显示后窗口可见状态: %s", self.shortcut_window.isVisible())
         except Exception as e:
-            logger.error(f"处理热键按下时出错: {str(e)}", exc_info=True)
+            logger.error("处理热键按下时出错: %s", e, exc_info=True)
     
     def on_hotkey_released(self):
         """
@@ -612,7 +422,7 @@ class ShortcutTool:
             logger.info("热键松开，隐藏快捷键窗口")
             self.shortcut_window.hide()
         except Exception as e:
-            logger.error(f"处理热键松开时出错: {str(e)}", exc_info=True)
+            logger.error("处理热键松开时出错: %s", e, exc_info=True)
     
     def test_show_shortcuts(self):
         """
@@ -621,7 +431,7 @@ class ShortcutTool:
         try:
             logger.info("手动测试显示快捷键窗口")
             # 获取当前活动窗口的进程名
-            process_name = self.context_monitor.get_current_process_name()
+            process_name = self._get_proc_cached()
             logger.info(f"当前活动窗口进程名: {process_name}")
             
             # 显示对应的快捷键列表
@@ -635,14 +445,27 @@ class ShortcutTool:
         """
         显示设置对话框
         """
-        dialog = SettingsDialog()
+        from PyQt6.QtWidgets import QDialog
+        from settings_dialog import SettingsDialog
+        
+        dialog = self._settings_dialog
+        if dialog is None:
+            dialog = self._settings_dialog = SettingsDialog()
+        else:
+            # 复用已有对话框，重新读取设置和进程映射，丢弃上次取消时的修改
+            dialog.reload()
         if dialog.exec() == QDialog.DialogCode.Accepted:
+            # 设置已写入 QSettings，刷新缓存的配置
+            old_cfg = self._cfg
+            self._reload_cfg()
+            
             # 清除进程映射缓存
             from context_monitor import ContextMonitor
             ContextMonitor.clear_mapping_cache()
+            self._proc_cache = None
             
-            # 重新初始化模块
-            self.init_modules()
+            # 只应用变化的部分
+            self._apply_cfg_changes(old_cfg)
             
             # 显示提示
             self.tray_icon.showMessage("设置已更新", "快捷键、窗口设置和进程映射已更新", QSystemTrayIcon.MessageIcon.Information, 2000)
@@ -701,6 +524,9 @@ class ShortcutTool:
         try:
             return self.app.exec()
         finally:
+            if self._settings_dialog is not None:
+                self._settings_dialog.deleteLater()
+                self._settings_dialog = None
             self._cleanup_single_instance()
     
     def get_hotkey_text(self):
@@ -710,20 +536,9 @@ class ShortcutTool:
         Returns:
             str: 热键文本，例如 "Ctrl+F1"
         """
-        parts = []
-        
-        if self.settings.value("hotkey/ctrl", True, type=bool):
-            parts.append("Ctrl")
-        
-        if self.settings.value("hotkey/shift", True, type=bool):
-            parts.append("Shift")
-        
-        if self.settings.value("hotkey/alt", False, type=bool):
-            parts.append("Alt")
-        
-        parts.append(self.settings.value("hotkey/key", "F1"))
-        
-        return "+".join(parts)
+        cfg = self._cfg
+        return _fmt_hotkey(cfg["hotkey/ctrl"], cfg["hotkey/shift"],
+                           cfg["hotkey/alt"], cfg["hotkey/key"])
 
 
 # 程序入口
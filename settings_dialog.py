@@ -0,0 +1,453 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+settings_dialog.py
+设置对话框，只在用户打开设置时才由 main.py 导入。
+"""
+
+import os, logging, json, functools, tempfile
+from types import MappingProxyType
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+                             QPushButton, QSlider, QColorDialog, QComboBox,
+                             QSpinBox, QMessageBox, QFileDialog, QGroupBox, QFormLayout,
+                             QListWidget, QListWidgetItem, QInputDialog, QTabWidget, QWidget,
+                             QCheckBox)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+
+from autostart_manager import AutostartManager
+from app_settings import settings
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+logger = logging.getLogger(__name__)
+
+# 数据文件路径（模块导入时计算一次）
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_MAPPING_FILE_PATH = os.path.join(_MODULE_DIR, "process_mapping.json")
+_DEFAULT_DATA_FILE = os.path.join(_MODULE_DIR, "shortcuts.json")
+
+# 映射文件不存在时使用的默认映射
+_DEFAULT_MAPPINGS = MappingProxyType({
+    "chrome.exe": "chrome.exe",
+    "firefox.exe": "firefox.exe",
+    "msedge.exe": "chrome.exe",
+    "code.exe": "code.exe",
+    "notepad++.exe": "notepad++.exe",
+    "explorer.exe": "explorer.exe"
+})
+
+# 热键可选的主键，模块导入时生成一次
+_KEY_OPTIONS = tuple(
+    # 功能键
+    [f"F{i}" for i in range(1, 13)] +
+    # 数字键
+    [str(i) for i in range(10)] +
+    # 字母键
+    [chr(i) for i in range(ord('A'), ord('Z') + 1)] +
+    # 小键盘
+    [f"Num{i}" for i in range(10)] +
+    # 方向键
+    ["Up", "Down", "Left", "Right"] +
+    # 特殊键
+    ["Space", "Tab", "Enter", "Esc", "Backspace", "Delete", 
+     "Home", "End", "PageUp", "PageDown", "Insert"] +
+    # 标点符号
+    [";", "=", ",", "-", ".", "/", "`", "[", "\\", "]", "'"]
+)
+_CTRL_OPTIONS = ("Ctrl", "无")
+_SHIFT_OPTIONS = ("Shift", "无")
+_ALT_OPTIONS = ("Alt", "无")
+_FONT_FAMILIES = ("Microsoft YaHei", "Arial", "SimSun")
+
+
+@functools.lru_cache(maxsize=4)
+def _load_mappings_cached(path, mtime_ns):
+    """读取并缓存进程映射文件
+    
+    以文件路径和修改时间为键，文件未改动时重复打开设置不再解析 JSON。
+    
+    Args:
+        path: 映射文件路径
+        mtime_ns: 文件修改时间（纳秒），仅用作缓存键
+        
+    Returns:
+        Mapping: 只读的映射字典
+    """
+    with open(path, 'rb') as f:
+        data = _json_loads(f.read())
+    return MappingProxyType(data.get("mappings", {}))
+
+@functools.lru_cache(maxsize=128)
+def _bg_css(name):
+    """生成颜色按钮的背景样式表，相同颜色复用同一字符串"""
+    return f"background:{name}"
+
+class SettingsDialog(QDialog):
+    """简洁设置对话框"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("设置")
+        self.setFixedSize(500, 600)
+        self.settings = settings()
+        self.process_mappings = {}
+        self.autostart_manager = AutostartManager()
+        self._load_process_mappings()
+        self._build_ui()
+        self._load()
+
+    def reload(self):
+        """重新读取设置和进程映射，复用对话框再次打开前调用"""
+        self._load_process_mappings()
+        self._update_mapping_list()
+        self._load()
+
+    def _load_process_mappings(self):
+        """加载进程映射配置"""
+        try:
+            mapping_file = _MAPPING_FILE_PATH
+            # 直接 stat 取修改时间，文件不存在时走异常分支，省去一次 exists 检查
+            try:
+                mtime_ns = os.stat(mapping_file).st_mtime_ns
+            except FileNotFoundError:
+                mappings = _DEFAULT_MAPPINGS
+            else:
+                mappings = _load_mappings_cached(mapping_file, mtime_ns)
+            # 对话框会修改映射，复制一份可写字典
+            self.process_mappings = dict(mappings)
+        except Exception as e:
+            logger.error(f"加载进程映射失败: {e}")
+            self.process_mappings = {}
+
+    def _save_process_mappings(self):
+        """保存进程映射配置"""
+        try:
+            mapping_file = _MAPPING_FILE_PATH
+            data = {
+                "mappings": self.process_mappings,
+                "description": "进程名映射配置文件，左侧为实际进程名，右侧为shortcuts.json中对应的配置键名"
+            }
+            # 先写临时文件再替换，读取方不会看到写了一半的文件
+            fd, tmp_path = tempfile.mkstemp(prefix=".process_mapping.", suffix=".tmp",
+                                            dir=os.path.dirname(mapping_file))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(_json_dumps(data))
+                os.replace(tmp_path, mapping_file)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            # 同一时间戳精度内的重复写入也要让缓存失效
+            _load_mappings_cached.cache_clear()
+            logger.info("进程映射配置已保存")
+        except Exception as e:
+            logger.error(f"保存进程映射失败: {e}")
+
+    def _build_ui(self):
+        layout = QVBoxLayout(self)
+        
+        # 创建选项卡
+        tab_widget = QTabWidget()
+        
+        # 基本设置选项卡
+        basic_tab = QWidget()
+        basic_layout = QVBoxLayout(basic_tab)
+        
+        # 热键
+        hotkey_box = QGroupBox("热键")
+        hotkey_layout = QHBoxLayout(hotkey_box)
+        self.ctrl_cb = QComboBox(); self.ctrl_cb.addItems(_CTRL_OPTIONS)
+        self.shift_cb = QComboBox(); self.shift_cb.addItems(_SHIFT_OPTIONS)
+        self.alt_cb = QComboBox(); self.alt_cb.addItems(_ALT_OPTIONS)
+        self.key_cb = QComboBox()
+        # 添加所有支持的按键选项
+        self.key_cb.addItems(_KEY_OPTIONS)
+        for w in (QLabel("全局热键:"), self.ctrl_cb, self.shift_cb, self.alt_cb, self.key_cb):
+            hotkey_layout.addWidget(w)
+        basic_layout.addWidget(hotkey_box)
+
+        # 窗口
+        win_box = QGroupBox("窗口")
+        win_layout = QVBoxLayout(win_box)
+        opacity_layout = QHBoxLayout()
+        self.opacity_slider = QSlider(Qt.Orientation.Horizontal)
+        self.opacity_slider.setRange(50,100)
+        self.opacity_lbl = QLabel("90%")
+        self.opacity_slider.valueChanged.connect(lambda v: self.opacity_lbl.setText(f"{v}%"))
+        for w in (QLabel("透明度:"), self.opacity_slider, self.opacity_lbl):
+            opacity_layout.addWidget(w)
+        win_layout.addLayout(opacity_layout)
+
+        color_layout = QHBoxLayout()
+        self.bg_btn = QPushButton(); self.bg_btn.setFixedWidth(80); self.bg_btn.clicked.connect(lambda: self._pick_color(self.bg_btn))
+        color_layout.addWidget(QLabel("背景色:")); color_layout.addWidget(self.bg_btn)
+        win_layout.addLayout(color_layout)
+        basic_layout.addWidget(win_box)
+
+        # 字体
+        font_box = QGroupBox("字体")
+        font_layout = QFormLayout(font_box)
+        self.font_cb = QComboBox(); self.font_cb.addItems(_FONT_FAMILIES)
+        self.size_spin = QSpinBox(); self.size_spin.setRange(8,20)
+        font_layout.addRow("字体:", self.font_cb)
+        font_layout.addRow("大小:", self.size_spin)
+        self.font_color_btn = QPushButton(); self.font_color_btn.setFixedWidth(80); self.font_color_btn.clicked.connect(lambda: self._pick_color(self.font_color_btn))
+        font_layout.addRow("文字色:", self.font_color_btn)
+        basic_layout.addWidget(font_box)
+
+        # 自启动设置
+        autostart_box = QGroupBox("自启动")
+        autostart_layout = QVBoxLayout(autostart_box)
+        self.autostart_cb = QCheckBox("开机自动启动")
+        self.autostart_cb.setToolTip("启用后，程序将在Windows启动时自动运行")
+        autostart_layout.addWidget(self.autostart_cb)
+        basic_layout.addWidget(autostart_box)
+
+        # 数据文件
+        data_box = QGroupBox("数据文件")
+        data_layout = QHBoxLayout(data_box)
+        self.data_edit = QLineEdit(); self.data_edit.setReadOnly(True)
+        browse_btn = QPushButton("浏览..."); browse_btn.clicked.connect(self._browse)
+        data_layout.addWidget(self.data_edit); data_layout.addWidget(browse_btn)
+        basic_layout.addWidget(data_box)
+        
+        # 添加基本设置选项卡
+        tab_widget.addTab(basic_tab, "基本设置")
+        
+        # 进程映射选项卡
+        process_tab = QWidget()
+        process_layout = QVBoxLayout(process_tab)
+        
+        # 进程映射说明
+        info_label = QLabel("配置进程名映射，将实际运行的进程名映射到shortcuts.json中的配置键名：")
+        info_label.setWordWrap(True)
+        process_layout.addWidget(info_label)
+        
+        # 进程映射列表
+        mapping_box = QGroupBox("进程映射")
+        mapping_layout = QVBoxLayout(mapping_box)
+        
+        self.mapping_list = QListWidget()
+        self._update_mapping_list()
+        mapping_layout.addWidget(self.mapping_list)
+        
+        # 按钮布局
+        btn_layout = QHBoxLayout()
+        add_btn = QPushButton("添加映射")
+        add_btn.clicked.connect(self._add_mapping)
+        edit_btn = QPushButton("编辑映射")
+        edit_btn.clicked.connect(self._edit_mapping)
+        del_btn = QPushButton("删除映射")
+        del_btn.clicked.connect(self._delete_mapping)
+        
+        btn_layout.addWidget(add_btn)
+        btn_layout.addWidget(edit_btn)
+        btn_layout.addWidget(del_btn)
+        btn_layout.addStretch()
+        mapping_layout.addLayout(btn_layout)
+        
+        process_layout.addWidget(mapping_box)
+        
+        # 添加进程映射选项卡
+        tab_widget.addTab(process_tab, "进程映射")
+        
+        # 将选项卡添加到主布局
+        layout.addWidget(tab_widget)
+
+        # 按钮
+        main_btn_layout = QHBoxLayout()
+        save_btn = QPushButton("保存"); save_btn.clicked.connect(self.accept)
+        cancel_btn = QPushButton("取消"); cancel_btn.clicked.connect(self.reject)
+        main_btn_layout.addStretch(); main_btn_layout.addWidget(save_btn); main_btn_layout.addWidget(cancel_btn)
+        layout.addLayout(main_btn_layout)
+
+    def _update_mapping_list(self):
+        """更新进程映射列表显示（整表重建，仅在初始化时使用）"""
+        self.mapping_list.clear()
+        self._mapping_items = {}
+        for process_name, config_key in self.process_mappings.items():
+            self._put_mapping_item(process_name, config_key)
+
+    def _put_mapping_item(self, process_name, config_key):
+        """新增或更新单个映射对应的列表项，不重建整个列表"""
+        item_text = f"{process_name} → {config_key}"
+        item = self._mapping_items.get(process_name)
+        if item is None:
+            item = QListWidgetItem(item_text)
+            self.mapping_list.addItem(item)
+            self._mapping_items[process_name] = item
+        else:
+            item.setText(item_text)
+        # 列表项上记录 (进程名, 配置键)，编辑/删除时直接取出，无需解析显示文本
+        item.setData(Qt.ItemDataRole.UserRole, (process_name, config_key))
+        return item
+
+    def _remove_mapping_item(self, process_name):
+        """移除单个映射对应的列表项"""
+        item = self._mapping_items.pop(process_name, None)
+        if item is not None:
+            self.mapping_list.takeItem(self.mapping_list.row(item))
+    
+    def _add_mapping(self):
+        """添加新的进程映射"""
+        process_name, ok1 = QInputDialog.getText(self, "添加进程映射", "请输入进程名称（如：chrome.exe）:")
+        if ok1 and process_name.strip():
+            process_name = process_name.strip().lower()
+            config_key, ok2 = QInputDialog.getText(self, "添加进程映射", "请输入对应的配置键名（如：chrome.exe）:")
+            if ok2 and config_key.strip():
+                config_key = config_key.strip()
+                self.process_mappings[process_name] = config_key
+                self._put_mapping_item(process_name, config_key)
+                logger.info(f"添加进程映射: {process_name} → {config_key}")
+    
+    def _edit_mapping(self):
+        """编辑选中的进程映射"""
+        current_item = self.mapping_list.currentItem()
+        if not current_item:
+            QMessageBox.warning(self, "警告", "请先选择要编辑的映射项")
+            return
+        
+        process_name, config_key = current_item.data(Qt.ItemDataRole.UserRole)
+        
+        new_process_name, ok1 = QInputDialog.getText(self, "编辑进程映射", "进程名称:", text=process_name)
+        if ok1 and new_process_name.strip():
+            new_process_name = new_process_name.strip().lower()
+            new_config_key, ok2 = QInputDialog.getText(self, "编辑进程映射", "配置键名:", text=config_key)
+            if ok2 and new_config_key.strip():
+                new_config_key = new_config_key.strip()
+                
+                # 进程名改变时删除旧映射
+                if new_process_name != process_name:
+                    del self.process_mappings[process_name]
+                    self._remove_mapping_item(process_name)
+                
+                # 添加新映射
+                self.process_mappings[new_process_name] = new_config_key
+                self.mapping_list.setCurrentItem(self._put_mapping_item(new_process_name, new_config_key))
+                logger.info(f"编辑进程映射: {process_name} → {config_key} 改为 {new_process_name} → {new_config_key}")
+    
+    def _delete_mapping(self):
+        """删除选中的进程映射"""
+        current_item = self.mapping_list.currentItem()
+        if not current_item:
+            QMessageBox.warning(self, "警告", "请先选择要删除的映射项")
+            return
+        
+        process_name, config_key = current_item.data(Qt.ItemDataRole.UserRole)
+        
+        reply = QMessageBox.question(self, "确认删除", f"确定要删除映射 '{process_name} → {config_key}' 吗？",
+                                   QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            del self.process_mappings[process_name]
+            self._remove_mapping_item(process_name)
+            logger.info(f"删除进程映射: {process_name} → {config_key}")
+
+    @staticmethod
+    def _apply_color(btn, name):
+        """设置颜色按钮的文字和背景，并缓存解析好的 QColor 供取色对话框使用"""
+        btn._qcolor = QColor(name)
+        btn.setText(name); btn.setStyleSheet(_bg_css(name))
+
+    def _pick_color(self, btn):
+        c = QColorDialog.getColor(btn._qcolor, self)
+        if c.isValid():
+            self._apply_color(btn, c.name())
+
+    def _browse(self):
+        path, _ = QFileDialog.getOpenFileName(self, "选择快捷键数据文件", "", "JSON (*.json)")
+        if path: self.data_edit.setText(path)
+
+    def _load(self):
+        # 先一次性读出全部设置，再填充控件
+        settings = self.settings
+        cfg = {
+            "hotkey/ctrl": settings.value("hotkey/ctrl", True, bool),
+            "hotkey/shift": settings.value("hotkey/shift", True, bool),
+            "hotkey/alt": settings.value("hotkey/alt", False, bool),
+            "hotkey/key": settings.value("hotkey/key", "F1"),
+            "window/opacity": settings.value("window/opacity", 0.9),
+            "window/bg_color": settings.value("window/bg_color", "#2E2E2E"),
+            "font/family": settings.value("font/family", "Microsoft YaHei"),
+            "font/size": settings.value("font/size", 10, int),
+            "font/color": settings.value("font/color", "#FFFFFF"),
+            "data/file_path": settings.value("data/file_path", ""),
+        }
+        
+        def set_combo(cb, val, default=True):
+            cb.setCurrentIndex(0 if val else 1)
+        set_combo(self.ctrl_cb, cfg["hotkey/ctrl"])
+        set_combo(self.shift_cb, cfg["hotkey/shift"])
+        set_combo(self.alt_cb, cfg["hotkey/alt"])
+        self.key_cb.setCurrentText(cfg["hotkey/key"])
+
+        self.opacity_slider.setValue(int(float(cfg["window/opacity"])*100))
+        bg = cfg["window/bg_color"]
+        self._apply_color(self.bg_btn, bg)
+
+        self.font_cb.setCurrentText(cfg["font/family"])
+        self.size_spin.setValue(cfg["font/size"])
+        fc = cfg["font/color"]
+        self._apply_color(self.font_color_btn, fc)
+
+        data = cfg["data/file_path"]
+        if not data:
+            data = _DEFAULT_DATA_FILE
+        self.data_edit.setText(data)
+        
+        # 加载自启动状态
+        self.autostart_cb.setChecked(self.autostart_manager.is_autostart_enabled())
+
+    def accept(self):
+        # 按分组写入，最后统一 sync 一次
+        settings = self.settings
+        settings.beginGroup("hotkey")
+        settings.setValue("ctrl", self.ctrl_cb.currentText()=="Ctrl")
+        settings.setValue("shift", self.shift_cb.currentText()=="Shift")
+        settings.setValue("alt", self.alt_cb.currentText()=="Alt")
+        settings.setValue("key", self.key_cb.currentText())
+        settings.endGroup()
+        settings.beginGroup("window")
+        settings.setValue("opacity", self.opacity_slider.value()/100)
+        settings.setValue("bg_color", self.bg_btn.text())
+        settings.endGroup()
+        settings.beginGroup("font")
+        settings.setValue("family", self.font_cb.currentText())
+        settings.setValue("size", self.size_spin.value())
+        settings.setValue("color", self.font_color_btn.text())
+        settings.endGroup()
+        settings.beginGroup("data")
+        settings.setValue("file_path", self.data_edit.text())
+        settings.endGroup()
+        settings.sync()
+        
+        # 保存自启动设置
+        try:
+            if self.autostart_cb.isChecked():
+                if not self.autostart_manager.is_autostart_enabled():
+                    success = self.autostart_manager.enable_autostart()
+                    if not success:
+                        QMessageBox.warning(self, "警告", "启用开机自启动失败，可能需要管理员权限")
+            else:
+                if self.autostart_manager.is_autostart_enabled():
+                    success = self.autostart_manager.disable_autostart()
+                    if not success:
+                        QMessageBox.warning(self, "警告", "禁用开机自启动失败")
+        except Exception as e:
+            logger.error(f"保存自启动设置失败: {e}")
+            QMessageBox.warning(self, "错误", f"保存自启动设置失败: {str(e)}")
+        
+        # 保存进程映射配置
+        self._save_process_mappings()
+        
+        super().accept()
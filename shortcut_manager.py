@@ -9,15 +9,28 @@ shortcut_manager.py
 """
 
 import os
+import re
+import sys
 import json
+import functools
 import logging
-import jsonschema
-from typing import List, Dict, Any, Optional
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Tuple
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# 进程配置键的格式；校验器只构建一次，正则也只编译一次
+_PROCESS_KEY_PATTERN = r"^[a-z0-9_.-]+$"
+_PROCESS_KEY_RE = re.compile(_PROCESS_KEY_PATTERN)
+
 # JSON Schema 定义
 SHORTCUT_SCHEMA = {
     "$schema": "http://json-schema.org/draft-07/schema#",
@@ -30,7 +43,7 @@ SHORTCUT_SCHEMA = {
         }
     },
     "patternProperties": {
-        "^[a-z0-9_.-]+$": {
+        _PROCESS_KEY_PATTERN: {
             "type": "array", 
             "items": {"$ref": "#/definitions/shortcut"}
         }
@@ -60,17 +73,216 @@ SHORTCUT_SCHEMA = {
     }
 }
 
-class ShortcutFileHandler(FileSystemEventHandler):
-    """快捷键文件变更监听器"""
+# 加载后的单条快捷键，比字典更省内存，读取字段也更快
+Shortcut = namedtuple("Shortcut", "key desc tags when group", defaults=(None, None, None))
+
+
+def _to_shortcuts(items) -> Tuple[Shortcut, ...]:
+    """把 JSON 中的快捷键字典列表转换为 Shortcut 元组，已转换的直接返回
+    
+    按键和描述文本会被驻留，不同进程中重复的 "Ctrl+C"、"复制" 等只保留一份。
+    
+    Args:
+        items: 快捷键字典列表或已转换的 Shortcut 元组
+        
+    Returns:
+        tuple: Shortcut 元组
+    """
+    if isinstance(items, tuple):
+        return items
+    return tuple(
+        Shortcut(sys.intern(item["key"]), sys.intern(item["desc"]),
+                 tuple(item["tags"]) if "tags" in item else None,
+                 item.get("when"), item.get("group"))
+        for item in items
+    )
+
+# 单个进程的快捷键列表，增量校验时只校验发生变化的进程
+_SHORTCUT_LIST_SCHEMA = {
+    "$schema": SHORTCUT_SCHEMA["$schema"],
+    "type": "array",
+    "items": SHORTCUT_SCHEMA["definitions"]["shortcut"]
+}
+
+# 编译好的整体校验函数、单进程列表校验函数和对应的校验异常类型
+_Validators = namedtuple("_Validators", "validate validate_list error")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_validators():
+    """首次加载配置时导入校验库并构建校验器，之后直接复用
+    
+    校验库的导入开销较大，放到第一次 load() 时才付出。
+    安装了 fastjsonschema 时把 schema 编译成专用的校验函数，否则使用 jsonschema。
+    
+    Returns:
+        _Validators: 校验函数及异常类型
+    """
+    try:
+        import fastjsonschema
+        return _Validators(fastjsonschema.compile(SHORTCUT_SCHEMA),
+                           fastjsonschema.compile(_SHORTCUT_LIST_SCHEMA),
+                           fastjsonschema.JsonSchemaException)
+    except ImportError:
+        import jsonschema
+        validator_cls = jsonschema.validators.validator_for(SHORTCUT_SCHEMA)
+        validator_cls.check_schema(SHORTCUT_SCHEMA)
+        return _Validators(validator_cls(SHORTCUT_SCHEMA).validate,
+                           validator_cls(_SHORTCUT_LIST_SCHEMA).validate,
+                           jsonschema.ValidationError)
+
+_MISSING = object()
+
+
+def _error_message(e):
+    """取出校验异常的说明文字
+    
+    jsonschema.ValidationError 与 fastjsonschema.JsonSchemaValueException 有 message 属性，
+    fastjsonschema 的基类 JsonSchemaException（_validate_changed 重新抛出的类型）没有。
+    
+    Args:
+        e: 校验异常
+        
+    Returns:
+        str: 说明文字
+    """
+    return getattr(e, "message", None) or str(e)
+
+
+def _validate_changed(data, previous):
+    """只校验相对上次成功加载发生变化的进程配置
+    
+    与上次内容相同的进程直接跳过；没有上次的数据时做完整校验。
+    各进程的快捷键列表互不引用，逐个校验与整体校验结果一致。
+    
+    Args:
+        data: 新读取的配置
+        previous: 上次校验通过的配置，没有时为 None
+        
+    Raises:
+        _get_validators().error: 配置不符合 schema
+    """
+    validators = _get_validators()
+    if previous is None or not isinstance(data, dict):
+        validators.validate(data)
+        return
+    error = validators.error
+    for key, items in data.items():
+        if previous.get(key, _MISSING) == items:
+            continue
+        if not _PROCESS_KEY_RE.search(key):
+            raise error(f"不允许的配置键: {key!r}")
+        try:
+            validators.validate_list(items)
+        except error as e:
+            raise error(f"{key}: {_error_message(e)}") from e
+
+# 文件变更后等待的时间（秒），编辑器一次保存产生的多个事件合并为一次重载
+_RELOAD_DEBOUNCE_S = 0.25
+
+# 网络驱动器上改用轮询监视时的轮询间隔（秒）
+_POLL_INTERVAL_S = 1.0
+_DRIVE_REMOTE = 4
+
+
+def _is_remote_dir(path: str) -> bool:
+    """判断目录是否位于网络驱动器（映射盘或 UNC 路径）上
+    
+    原生的 ReadDirectoryChangesW 在 SMB 等网络共享上会漏掉事件，需要改用轮询。
+    
+    Args:
+        path: 目录绝对路径
+        
+    Returns:
+        bool: 是否为网络驱动器
+    """
+    if sys.platform != "win32":
+        return False
+    import ctypes
+    root = os.path.splitdrive(path)[0]
+    if not root:
+        return False
+    return ctypes.windll.kernel32.GetDriveTypeW(root + "\\") == _DRIVE_REMOTE
+
+class ShortcutFileHandler:
+    """快捷键文件变更监听器
+    
+    实现 watchdog 事件处理器的 dispatch 接口，不继承 FileSystemEventHandler，
+    只有真正开始监视时才需要导入 watchdog。
+    """
     
-    def __init__(self, callback):
+    __slots__ = ("callback", "_target", "_timer", "_lock")
+    
+    def __init__(self, callback, target_path):
+        """
+        Args:
+            callback: 文件变更后调用的重载函数
+            target_path: 被监视的快捷键配置文件路径
+        """
         self.callback = callback
+        self._target = os.path.abspath(target_path)
+        self._timer = None
+        self._lock = threading.Lock()
+        
+    @property
+    def target(self):
+        """被监视的配置文件绝对路径"""
+        return self._target
+
+    def retarget(self, target_path):
+        """改为监视同一目录下的另一个文件，并取消尚未触发的重载
         
+        Args:
+            target_path: 新的配置文件路径
+        """
+        self.cancel()
+        self._target = os.path.abspath(target_path)
+
+    def dispatch(self, event):
+        """watchdog 调用的入口，按事件类型分发"""
+        handler = getattr(self, f"on_{event.event_type}", None)
+        if handler is not None:
+            handler(event)
+
+    def _is_target(self, path):
+        """判断事件路径是否为被监视的配置文件"""
+        return os.path.abspath(path) == self._target
+
     def on_modified(self, event):
-        if not event.is_directory and event.src_path.endswith('.json'):
-            self.callback()
+        # 只关心目标文件，同目录下其他 JSON 文件的改动直接忽略
+        if not event.is_directory and self._is_target(event.src_path):
+            self._schedule()
+
+    def on_created(self, event):
+        # 先删除再重建的保存方式
+        if not event.is_directory and self._is_target(event.src_path):
+            self._schedule()
+
+    def on_moved(self, event):
+        # 原子保存的编辑器会把临时文件重命名覆盖到目标文件
+        if not event.is_directory and self._is_target(event.dest_path):
+            self._schedule()
+
+    def _schedule(self):
+        """（重新）开始计时，时间窗内的最后一个事件才触发重载"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(_RELOAD_DEBOUNCE_S, self.callback)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        """取消尚未触发的重载"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
 
 class ShortcutManager:
+    __slots__ = ("json_file_path", "shortcuts", "_shortcuts_lc", "_alias_index", "_base_index",
+                 "_lookup_cache", "_process_keys", "_validated", "_last_stat", "observer", "file_handler")
+    
     DEFAULT_SHORTCUTS = {
         "default": [
             {"key": "Ctrl+C", "desc": "复制"},
@@ -135,6 +347,17 @@ class ShortcutManager:
         """
         self.json_file_path = json_file_path or "shortcuts.json"
         self.shortcuts = {}
+        # 加载时生成的小写键配置、别名索引和去后缀匹配索引
+        self._shortcuts_lc = {}
+        self._alias_index = {}
+        self._base_index = {}
+        # 进程名 → 快捷键列表的查询缓存，配置重新加载时清空
+        self._lookup_cache = {}
+        self._process_keys = ()
+        # 上次校验通过的配置，重载时未变化的进程不再校验
+        self._validated = None
+        # 上次成功加载时文件的 (修改时间, 大小)
+        self._last_stat = None
         self.observer = None
         self.file_handler = None
         self.load(self.json_file_path)
@@ -149,106 +372,214 @@ class ShortcutManager:
             bool: 加载是否成功
         """
         self.json_file_path = file_path
+        # 只有成功加载后才记录文件指纹，失败后的 reload 总会重新读取
+        self._last_stat = None
+        previous, self._validated = self._validated, None
         
-        if not os.path.exists(file_path):
+        # 直接打开文件，不存在时走异常分支；不先 exists 检查，避免编辑器重命名保存时的竞争
+        try:
+            with open(file_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                raw = f.read()
+        except FileNotFoundError:
             logger.warning(f"快捷键配置文件不存在: {file_path}，使用默认配置")
-            self.shortcuts = self.DEFAULT_SHORTCUTS.copy()
+            self._set_shortcuts(_FROZEN_DEFAULTS)
             return False
+        except OSError as e:
+            logger.error("读取快捷键配置失败: %s", e)
+            self._set_shortcuts(_FROZEN_DEFAULTS)
+            return False
+        
+        # json / orjson 的解析错误以及非 UTF-8 内容都是 ValueError 的子类
+        try:
+            data = _json_loads(raw)
+        except ValueError as e:
+            logger.error("快捷键配置不是有效的 JSON: %s", e)
+            self._set_shortcuts(_FROZEN_DEFAULTS)
+            return False
+        finally:
+            # 解析完成后立即释放原始字节，校验和转换期间不再同时持有两份数据
+            del raw
             
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
             # Schema 校验
+            validation_error = _get_validators().error
             try:
-                jsonschema.validate(data, SHORTCUT_SCHEMA)
+                _validate_changed(data, previous)
                 logger.info("JSON schema 校验通过")
-            except jsonschema.ValidationError as e:
-                logger.error(f"JSON schema 校验失败: {e.message}")
+            except validation_error as e:
+                logger.error(f"JSON schema 校验失败: {_error_message(e)}")
                 logger.warning("将使用默认配置")
-                self.shortcuts = self.DEFAULT_SHORTCUTS.copy()
+                self._set_shortcuts(_FROZEN_DEFAULTS)
                 return False
                 
-            self.shortcuts = data
-            logger.info(f"成功加载快捷键配置: {file_path}")
-            return True
-            
+            self._set_shortcuts(data)
         except Exception as e:
-            logger.error(f"加载快捷键配置失败: {e}")
-            self.shortcuts = self.DEFAULT_SHORTCUTS.copy()
+            # 只剩校验库缺失等意外情况
+            logger.error("加载快捷键配置失败: %s", e, exc_info=True)
+            self._set_shortcuts(_FROZEN_DEFAULTS)
             return False
+        
+        self._validated = data
+        self._last_stat = (st.st_mtime_ns, st.st_size)
+        logger.info(f"成功加载快捷键配置: {file_path}")
+        return True
 
-    def get_shortcuts_for_process(self, process_name: str) -> List[Dict[str, Any]]:
+    def _set_shortcuts(self, shortcuts: Mapping[str, Any]):
+        """替换当前配置，重建查找索引并清空依赖旧配置的查询缓存
+        
+        Args:
+            shortcuts: 新的快捷键配置
+        """
+        # 各进程的快捷键列表转换为 Shortcut 元组；只读的默认配置已经转换过，直接共享
+        if isinstance(shortcuts, MappingProxyType):
+            compact = shortcuts
+        else:
+            compact = {sys.intern(key): _to_shortcuts(items) for key, items in shortcuts.items()}
+        
+        # 别名 → 快捷键元组，同一别名以先出现的配置为准
+        alias_index = {}
+        for key, items in shortcuts.items():
+            if key == "default":
+                continue
+            # 检查是否有aliases配置
+            if isinstance(items, list) and items:
+                first_item = items[0]
+                if isinstance(first_item, dict) and "aliases" in first_item:
+                    aliases = first_item["aliases"]
+                    if isinstance(aliases, list):
+                        for alias in aliases:
+                            alias_index.setdefault(alias.lower(), compact[key])
+        
+        # 配置键统一转为小写，查询时不必再考虑大小写
+        shortcuts_lc = {key.lower(): items for key, items in compact.items()}
+        
+        self.shortcuts = compact
+        self._shortcuts_lc = shortcuts_lc
+        self._alias_index = alias_index
+        # "xxx.exe" → 配置键 "xxx" 的快捷键列表
+        self._base_index = {f"{key}.exe": items for key, items in shortcuts_lc.items()}
+        self._lookup_cache = {}
+        self._process_keys = tuple(compact)
+
+    def get_shortcuts_for_process(self, process_name: str) -> Tuple[Shortcut, ...]:
         """根据进程名获取对应的快捷键列表
         
         支持精确匹配、别名匹配、模糊匹配和默认回退。
+        同一进程名的查询结果会被缓存，直到配置重新加载。
         
         Args:
             process_name: 进程名（如 'code.exe'）
             
         Returns:
-            list: 快捷键列表
+            tuple: Shortcut 元组
         """
+        cache = self._lookup_cache
+        try:
+            return cache[process_name]
+        except KeyError:
+            pass
+        result = cache[process_name] = self._match_shortcuts(process_name)
+        return result
+
+    def _match_shortcuts(self, process_name: str) -> Tuple[Shortcut, ...]:
+        """按匹配策略查找进程的快捷键列表，不经过缓存
+        
+        Args:
+            process_name: 进程名
+            
+        Returns:
+            tuple: Shortcut 元组
+        """
+        shortcuts = self._shortcuts_lc
         if not process_name:
-            return self.shortcuts.get("default", [])
+            return shortcuts.get("default", ())
         
         process_name = process_name.lower()
         
         # 1. 精确匹配
-        if process_name in self.shortcuts:
-            return self.shortcuts[process_name]
+        hit = shortcuts.get(process_name)
+        if hit is not None:
+            return hit
         
-        # 2. 别名匹配（检查每个进程配置中的aliases字段）
-        for key, shortcuts in self.shortcuts.items():
-            if key == "default":
-                continue
-            # 检查是否有aliases配置
-            if isinstance(shortcuts, list) and shortcuts:
-                first_item = shortcuts[0]
-                if isinstance(first_item, dict) and "aliases" in first_item:
-                    aliases = first_item["aliases"]
-                    if isinstance(aliases, list) and process_name in [alias.lower() for alias in aliases]:
-                        return shortcuts
+        # 2. 别名匹配（索引在加载时由各进程配置中的aliases字段生成）
+        hit = self._alias_index.get(process_name)
+        if hit is not None:
+            return hit
         
-        # 3. 模糊匹配（去掉.exe后缀）
-        if process_name.endswith('.exe'):
-            base_name = process_name[:-4]
-            if base_name in self.shortcuts:
-                return self.shortcuts[base_name]
+        # 3. 模糊匹配（去掉.exe后缀，索引键为 "<配置键>.exe"）
+        hit = self._base_index.get(process_name)
+        if hit is not None:
+            return hit
         
         # 4. 返回默认快捷键
-        return self.shortcuts.get("default", [])
+        return shortcuts.get("default", ())
 
-    def get_all_process_keys(self) -> List[str]:
-        """获取所有已配置快捷键的进程名列表
+    def get_all_process_keys(self) -> Tuple[str, ...]:
+        """获取所有已配置快捷键的进程名
+        
+        结果在加载配置时生成，调用方共享同一个只读元组。
         
         Returns:
-            list: 进程名列表
+            tuple: 进程名元组
         """
-        return list(self.shortcuts.keys())
+        return self._process_keys
 
     def reload(self) -> bool:
         """重新加载快捷键配置
         
+        文件的修改时间和大小与上次成功加载时一致时直接返回，不再解析和校验。
+        
         Returns:
             bool: 重载是否成功
         """
+        if self._last_stat is not None:
+            try:
+                st = os.stat(self.json_file_path)
+            except OSError:
+                pass
+            else:
+                if (st.st_mtime_ns, st.st_size) == self._last_stat:
+                    logger.debug("快捷键配置文件未变化，跳过重载")
+                    return True
         return self.load(self.json_file_path)
         
     def watch_for_changes(self) -> bool:
         """监视文件变更并自动重载
         
+        可重复调用：已在监视同一目录时只更新目标文件，不重建监视线程。
+        
         Returns:
             bool: 监视是否启动成功
         """
         try:
+            target = os.path.abspath(self.json_file_path)
+            watch_dir = os.path.dirname(target)
+            
+            # 已在监视同一目录时复用现有线程和处理器，重复调用不会再启动新线程
+            handler = self.file_handler
+            if (self.observer is not None and self.observer.is_alive() and handler is not None
+                    and os.path.dirname(handler.target) == watch_dir):
+                if handler.target != target:
+                    handler.retarget(target)
+                    logger.info(f"开始监视文件变更: {self.json_file_path}")
+                return True
+            
             if self.observer:
                 self.observer.stop()
+            if handler:
+                handler.cancel()
                 
-            self.file_handler = ShortcutFileHandler(self.reload)
-            self.observer = Observer()
+            self.file_handler = ShortcutFileHandler(self.reload, self.json_file_path)
+            if _is_remote_dir(watch_dir):
+                # 网络驱动器收不到可靠的变更通知，直接使用轮询监视
+                from watchdog.observers.polling import PollingObserver
+                self.observer = PollingObserver(timeout=_POLL_INTERVAL_S)
+                logger.info(f"数据文件位于网络驱动器，使用轮询方式监视: {watch_dir}")
+            else:
+                from watchdog.observers import Observer
+                self.observer = Observer()
             
-            watch_dir = os.path.dirname(os.path.abspath(self.json_file_path))
             self.observer.schedule(self.file_handler, watch_dir, recursive=False)
             self.observer.start()
             
@@ -266,6 +597,15 @@ class ShortcutManager:
             self.observer.join()
             self.observer = None
             logger.info("已停止文件监视")
+        if self.file_handler:
+            self.file_handler.cancel()
+
+# 只读的默认配置，模块导入时生成一次；加载失败时直接共享，不再每次复制，
+# 也不会被调用方意外修改
+_FROZEN_DEFAULTS = MappingProxyType({
+    sys.intern(key): _to_shortcuts(items)
+    for key, items in ShortcutManager.DEFAULT_SHORTCUTS.items()
+})
 
 if __name__ == "__main__":
     manager = ShortcutManager()
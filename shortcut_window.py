@@ -7,14 +7,223 @@ shortcut_window.py
 简洁的快捷键悬浮窗口实现。
 """
 
+import re
 import logging
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QScrollArea, QFrame, QHBoxLayout, QGridLayout, QSizePolicy, QGraphicsDropShadowEffect, QLayout, QApplication
-from PyQt6.QtCore import Qt, QPoint, QSettings
-from PyQt6.QtGui import QFont, QColor, QMouseEvent
+import functools
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QScrollArea, QFrame, QHBoxLayout, QGridLayout, QSizePolicy, QLayout, QApplication
+from PyQt6.QtCore import Qt, QPoint, QRect, QRectF, QSize, QObject, QThread, QTimer, QMetaObject, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QFont, QColor, QMouseEvent, QPainter, QPixmap, QImage
+
+from app_settings import window_settings, window_store
 
 logger = logging.getLogger(__name__)
 
+# 拖动窗口时合并保存请求，停止操作这么久之后才写一次设置（毫秒）
+_SAVE_DELAY_MS = 300
+
+# 多个快捷键之间的分隔符：" / "、"/" 或 " 或 "，两侧空白一并去掉
+_KEY_SPLIT_RE = re.compile(r"\s*/\s*|\s+或\s+")
+
+# 快捷键卡片相关的全部样式，程序启动后一次性安装到 QApplication，
+# 各部件只设置动态属性来匹配选择器，不再逐个调用 setStyleSheet
+SHORTCUT_QSS = """
+QWidget[shortcutTransparent="true"] {
+    background: transparent;
+}
+QWidget[shortcutCard="true"] {
+    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+        stop: 0 rgba(48, 48, 48, 0.92), stop: 1 rgba(32, 32, 32, 0.92));
+    border: 2px solid rgba(100, 149, 237, 0.5);
+    border-bottom-color: rgba(60, 90, 145, 0.7);
+    border-radius: 12px;
+}
+QWidget[shortcutCard="true"]:hover {
+    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+        stop: 0 rgba(58, 58, 58, 0.96), stop: 1 rgba(42, 42, 42, 0.96));
+    border: 2px solid rgba(100, 149, 237, 0.8);
+}
+QLabel[shortcutKey="single"] {
+    color: #ffffff;
+    font-weight: bold;
+    background: rgba(100, 149, 237, 0.8);
+    border-radius: 6px;
+    padding: 6px 10px;
+    border: 1px solid rgba(100, 149, 237, 1.0);
+}
+QLabel[shortcutKey="multi"] {
+    color: #ffffff;
+    font-weight: bold;
+    background: rgba(100, 149, 237, 0.8);
+    border-radius: 4px;
+    padding: 3px 6px;
+    border: 1px solid rgba(100, 149, 237, 1.0);
+    margin: 1px;
+}
+QLabel[shortcutDesc="true"] {
+    color: #ffffff;
+    background: transparent;
+    border: none;
+    padding: 4px;
+    font-weight: normal;
+}
+"""
+
+# 卡片创建时反复用到的枚举值，预先绑定到模块级名称
+_ALIGN_CENTER = Qt.AlignmentFlag.AlignCenter
+_BOLD = QFont.Weight.Bold
+_EXPANDING = QSizePolicy.Policy.Expanding
+_NO_FRAME = QFrame.Shape.NoFrame
+
+def _int_pair(value, default):
+    """
+    把保存的位置/大小转换成两个整数
+    
+    Args:
+        value: 保存的值，可能是列表、元组、QPoint 或 QSize
+        default (tuple): 无法转换时的默认值
+        
+    Returns:
+        list: [x, y] 或 [宽, 高]
+    """
+    if isinstance(value, QPoint):
+        return [value.x(), value.y()]
+    if isinstance(value, QSize):
+        return [value.width(), value.height()]
+    try:
+        first, second = value
+        return [int(first), int(second)]
+    except (TypeError, ValueError):
+        return list(default)
+
+
+# 特殊应用的显示名称（键为去掉 .exe 后缀的小写进程名）
+_NAME_MAPPING = {
+    'chrome': 'Google Chrome',
+    'firefox': 'Mozilla Firefox',
+    'msedge': 'Microsoft Edge',
+    'notepad': '记事本',
+    'notepad++': 'Notepad++',
+    'code': 'Visual Studio Code',
+    'explorer': '文件资源管理器',
+    'winword': 'Microsoft Word',
+    'excel': 'Microsoft Excel',
+    'powerpnt': 'Microsoft PowerPoint',
+    'acad': 'AutoCAD',
+    'cass': 'CASS'
+}
+_EXE_SUFFIX = ".exe"
+
+# update_settings 使用的窗口样式模板，{bg} 为 #AARRGGBB 背景色，{fg} 为文字颜色
+_WINDOW_QSS_TMPL = """
+#ShortcutWindow {{
+    background-color: {bg};
+    border: 1px solid rgba(255, 255, 255, 0.1);
+    border-radius: 10px;
+}}
+QLabel {{
+    color: {fg};
+}}
+"""
+
+# 卡片阴影：圆角半径与 SHORTCUT_QSS 中的卡片一致，向外扩散 _SHADOW_BLUR 像素，向下偏移
+_CARD_RADIUS = 12
+_SHADOW_BLUR = 8
+_SHADOW_OFFSET_Y = 5
+_SHADOW_ALPHA = 50
+
+
+@functools.lru_cache(maxsize=1)
+def _shadow_pixmap():
+    """
+    生成一张可九宫格拉伸的柔和阴影图，整个进程只绘制一次
+    
+    由外向内叠加多层半透明圆角矩形近似模糊边缘，中心只留 1 像素供拉伸。
+    
+    Returns:
+        QPixmap: 阴影图，四角各占 _SHADOW_BLUR + _CARD_RADIUS 像素
+    """
+    margin = _SHADOW_BLUR + _CARD_RADIUS
+    side = margin * 2 + 1
+    image = QImage(side, side, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(QColor(0, 0, 0, max(1, _SHADOW_ALPHA // _SHADOW_BLUR)))
+    for i in range(_SHADOW_BLUR):
+        radius = _CARD_RADIUS + _SHADOW_BLUR - i
+        painter.drawRoundedRect(QRectF(i, i, side - 2 * i, side - 2 * i), radius, radius)
+    painter.end()
+    return QPixmap.fromImage(image)
+
+
+def _draw_nine_slice(painter, pixmap, target, margin):
+    """
+    把九宫格图拉伸绘制到目标区域，四角保持原尺寸
+    
+    Args:
+        painter (QPainter): 画笔
+        pixmap (QPixmap): 九宫格图
+        target (QRect): 目标区域
+        margin (int): 四角的边长
+    """
+    side = pixmap.width()
+    src = ((0, margin), (margin, side - 2 * margin), (side - margin, margin))
+    x, y, w, h = target.x(), target.y(), target.width(), target.height()
+    dst_x = ((x, margin), (x + margin, w - 2 * margin), (x + w - margin, margin))
+    dst_y = ((y, margin), (y + margin, h - 2 * margin), (y + h - margin, margin))
+    for (sx, sw), (dx, dw) in zip(src, dst_x):
+        for (sy, sh), (dy, dh) in zip(src, dst_y):
+            if dw > 0 and dh > 0:
+                painter.drawPixmap(QRect(dx, dy, dw, dh), pixmap, QRect(sx, sy, sw, sh))
+
+
+class _CardContainer(QWidget):
+    """卡片网格的容器，在卡片下方统一绘制缓存的阴影图"""
+
+    def paintEvent(self, event):
+        pixmap = _shadow_pixmap()
+        margin = _SHADOW_BLUR + _CARD_RADIUS
+        painter = QPainter(self)
+        for child in self.children():
+            if isinstance(child, QWidget) and child.isVisible() and child.property("shortcutCard"):
+                target = child.geometry().adjusted(-_SHADOW_BLUR, -_SHADOW_BLUR, _SHADOW_BLUR, _SHADOW_BLUR)
+                _draw_nine_slice(painter, pixmap, target.translated(0, _SHADOW_OFFSET_Y), margin)
+        painter.end()
+
+    def resizeEvent(self, event):
+        # 卡片重新排布后阴影位置随之变化，整块重绘
+        super().resizeEvent(event)
+        self.update()
+
+
+class _SettingsWriter(QObject):
+    """在后台线程中写入窗口设置，GUI 线程不等待磁盘"""
+
+    def __init__(self, store):
+        super().__init__()
+        self._store = store
+
+    @pyqtSlot(dict)
+    def write(self, values):
+        """写入变化的键并立即落盘
+
+        Args:
+            values: 键名到新值的映射
+        """
+        self._store.update(values)
+
+    @pyqtSlot()
+    def flush(self):
+        """空操作；以阻塞方式调用时，返回即表示之前排队的写入都已完成"""
+
+
 class ShortcutWindow(QWidget):
+    # 请求后台写入设置，连接到写线程中的 _SettingsWriter.write
+    _save_requested = pyqtSignal(dict)
+    # SHORTCUT_QSS 是否已安装到 QApplication
+    _qss_installed = False
+
     def __init__(self, shortcut_manager):
         super().__init__()
         self.shortcut_manager = shortcut_manager
@@ -32,27 +241,65 @@ class ShortcutWindow(QWidget):
             pass  # 如果没有QtWinExtras，跳过毛玻璃效果
         # 仅为顶层窗口设置样式作用域
         self.setObjectName("ShortcutWindow")
+        self._install_qss()
 
-        self.settings = QSettings("ShortcutTool", "ShortcutWindow")
+        self.settings = window_store()
+        # 设置写线程在第一次保存时才启动
+        self._writer = None
+        self._writer_thread = None
+        # 合并短时间内的多次保存请求
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.save_settings)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._on_about_to_quit)
+        # 卡片区域和卡片池在第一次显示快捷键时创建，之后反复复用
+        self._card_area = None
+        self._card_grid = None
+        self._grid_columns = 0
+        self._card_pool = []
+        self._empty_label = None
         self.load_settings()
-        self.init_ui()
+        # 子部件在第一次显示快捷键时才创建（见 _ensure_ui）
+        self._ui_built = False
+        self._apply_base_style()
 
         self.dragging = False
         self.drag_position = QPoint()
     
+    @classmethod
+    def _install_qss(cls):
+        """把卡片样式追加到应用级样式表，整个进程只做一次"""
+        if cls._qss_installed:
+            return
+        app = QApplication.instance()
+        if app is None:
+            return
+        app.setStyleSheet(app.styleSheet() + SHORTCUT_QSS)
+        cls._qss_installed = True
+
+    def _ensure_ui(self):
+        """首次显示前创建窗口子部件"""
+        if self._ui_built:
+            return
+        self.init_ui()
+        self._ui_built = True
+
     def init_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
 
         self.title_label = QLabel("快捷键列表")
         self.title_label.setObjectName("titleLabel")
-        self.title_label.setFont(QFont(self.font_family, self.font_size + 2, QFont.Weight.Bold))
-        self.title_label.setStyleSheet(f"color: {self.font_color};")
+        self.title_label.setFont(self._title_font)
+        self.title_label.setStyleSheet(self._title_label_qss)
         layout.addWidget(self.title_label)
 
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.Shape.NoFrame)
+        scroll.setFrameShape(_NO_FRAME)
         scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
         self.content_widget = QWidget()
@@ -62,6 +309,10 @@ class ShortcutWindow(QWidget):
         scroll.setWidget(self.content_widget)
         layout.addWidget(scroll)
 
+    def _apply_base_style(self):
+        """
+        设置窗口的初始样式；在构造时设置，之后可被 update_settings 覆盖
+        """
         # 设置窗口样式（改善可读性）
         self.setStyleSheet(f"""
             #ShortcutWindow {{
@@ -94,48 +345,141 @@ class ShortcutWindow(QWidget):
 
     
     def load_settings(self):
-        pos = self.settings.value("pos", QPoint(100, 100))
-        size = self.settings.value("size", (400, 500))
-        # 兼容不同返回类型
-        try:
-            if hasattr(pos, 'x') and hasattr(pos, 'y'):
-                self.move(pos)
-            elif isinstance(pos, (tuple, list)) and len(pos) == 2:
-                self.move(int(pos[0]), int(pos[1]))
-            else:
-                self.move(100, 100)
-        except Exception:
-            self.move(100, 100)
+        # 设置已整体读入内存，这里只做字典查找
+        store = self.settings
+        if not store.exists:
+            # 首次使用 JSON 设置文件：从旧的 QSettings 迁移一次
+            store.update(self._read_legacy_settings())
+        self.move(*_int_pair(store.get("pos"), (100, 100)))
+        self.resize(*_int_pair(store.get("size"), (400, 500)))
         
-        try:
-            if hasattr(size, 'width') and hasattr(size, 'height'):
-                self.resize(size)
-            elif isinstance(size, (tuple, list)) and len(size) == 2:
-                self.resize(int(size[0]), int(size[1]))
-            else:
-                self.resize(400, 500)
-        except Exception:
-            self.resize(400, 500)
-
-        self.opacity = float(self.settings.value("opacity", 0.9))
-        self.bg_color = QColor(self.settings.value("bg_color", "#2E2E2E"))
-        self.font_family = self.settings.value("font_family", "Microsoft YaHei")
-        self.font_size = int(self.settings.value("font_size", 10))
-        self.font_color = self.settings.value("font_color", "#FFFFFF")
+        self.opacity = store.get("opacity", 0.9)
+        self.bg_color = QColor(store.get("bg_color", "#2E2E2E"))
+        self.font_family = store.get("font_family", "Microsoft YaHei")
+        self.font_size = store.get("font_size", 10)
+        self.font_color = store.get("font_color", "#FFFFFF")
+        self._refresh_style_cache()
+        
+        # 记录当前已持久化的值，保存时只写入变化的键
+        self._last_saved = self._settings_snapshot()
+    
+    def _read_legacy_settings(self):
+        """
+        读取旧版本保存在 QSettings 中的窗口设置，转换成可写入 JSON 的值
+        
+        Returns:
+            dict: 键名到设置值的映射
+        """
+        settings = window_settings()
+        values = {
+            "pos": _int_pair(settings.value("pos"), (100, 100)),
+            "size": _int_pair(settings.value("size"), (400, 500)),
+            "opacity": settings.value("opacity", 0.9, type=float),
+            "bg_color": settings.value("bg_color", "#2E2E2E", type=str),
+            "font_family": settings.value("font_family", "Microsoft YaHei", type=str),
+            "font_size": settings.value("font_size", 10, type=int),
+            "font_color": settings.value("font_color", "#FFFFFF", type=str),
+        }
+        logger.info("窗口设置已从 QSettings 迁移到 JSON 文件")
+        return values
+    
+    def _refresh_style_cache(self):
+        """
+        按当前字体设置预先构造各标签使用的 QFont 和样式字符串，
+        创建卡片时直接引用，只在设置变化后重新计算
+        """
+        family = self.font_family
+        key_size = self.font_size + 1
+        self._title_font = QFont(family, self.font_size + 2, _BOLD)
+        self._key_font_single = QFont(family, key_size, _BOLD)
+        # 两个以内的组合键略缩小，更多时再缩小一号
+        self._key_font_multi = QFont(family, max(9, key_size - 1), _BOLD)
+        self._key_font_multi_small = QFont(family, max(8, key_size - 2), _BOLD)
+        self._desc_font = QFont(family, self.font_size - 1)
+        self._empty_font = QFont(family, self.font_size)
+        self._title_label_qss = f"color: {self.font_color};"
+        self._empty_label_qss = f"color: {self.font_color}; padding: 20px;"
+    
+    def _settings_snapshot(self):
+        """
+        收集需要持久化的窗口设置
+        
+        Returns:
+            dict: 键名到当前值的映射
+        """
+        return {
+            "pos": [self.x(), self.y()],
+            "size": [self.width(), self.height()],
+            "opacity": self.opacity,
+            "bg_color": self.bg_color.name(),
+            "font_family": self.font_family,
+            "font_size": self.font_size,
+            "font_color": self.font_color,
+        }
     
     def save_settings(self):
         """
-        保存窗口设置到QSettings
+        保存窗口设置到 JSON 设置文件，只写入与上次保存不同的键
         """
-        self.settings.setValue("pos", self.pos())
-        self.settings.setValue("size", self.size())
-        self.settings.setValue("opacity", self.opacity)
-        self.settings.setValue("bg_color", self.bg_color.name())
-        self.settings.setValue("font_family", self.font_family)
-        self.settings.setValue("font_size", self.font_size)
-        self.settings.setValue("font_color", self.font_color)
+        snapshot = self._settings_snapshot()
+        last_saved = self._last_saved
+        changed = [key for key, value in snapshot.items() if last_saved.get(key) != value]
+        if not changed:
+            return
+        
+        # 交给写线程，拖动、缩放时不阻塞界面
+        self._ensure_writer()
+        self._save_requested.emit({key: snapshot[key] for key in changed})
+        self._last_saved = snapshot
         
-        logger.info("窗口设置已保存")
+        logger.info("窗口设置已保存: %s", ", ".join(changed))
+    
+    def _ensure_writer(self):
+        """
+        首次保存时创建设置写线程，程序退出前把排队的写入全部完成
+        """
+        if self._writer_thread is not None:
+            return
+        thread = QThread(self)
+        writer = _SettingsWriter(self.settings)
+        writer.moveToThread(thread)
+        thread.finished.connect(writer.deleteLater)
+        self._save_requested.connect(writer.write)
+        thread.start()
+        self._writer, self._writer_thread = writer, thread
+    
+    def request_save(self):
+        """
+        请求保存窗口设置；在 _SAVE_DELAY_MS 内的重复请求只会触发一次保存
+        """
+        self._save_timer.start()
+    
+    def _flush_pending_save(self):
+        """
+        如有尚未执行的延迟保存，立即保存
+        """
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self.save_settings()
+    
+    def _on_about_to_quit(self):
+        """
+        程序退出前写入待保存的设置并结束写线程
+        """
+        self._flush_pending_save()
+        self._stop_writer()
+    
+    def _stop_writer(self):
+        """
+        等待排队的设置写入完成后结束写线程
+        """
+        thread = self._writer_thread
+        if thread is None:
+            return
+        QMetaObject.invokeMethod(self._writer, "flush", Qt.ConnectionType.BlockingQueuedConnection)
+        thread.quit()
+        thread.wait()
+        self._writer = self._writer_thread = None
     
     def update_settings(self, settings_dict):
         """
@@ -162,26 +506,19 @@ class ShortcutWindow(QWidget):
         if "font_color" in settings_dict:
             self.font_color = settings_dict["font_color"]
         
-        # 应用新样式
-        alpha = int(self.opacity * 255)
-        self.setStyleSheet(f"""
-            #ShortcutWindow {{
-                background-color: rgba({self.bg_color.red()}, {self.bg_color.green()}, {self.bg_color.blue()}, {alpha});
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 10px;
-            }}
-            QLabel {{
-                color: {self.font_color};
-            }}
-        """)
+        self._refresh_style_cache()
+        
+        # 应用新样式：背景色带透明度直接写成 #AARRGGBB
+        bg_color = QColor(self.bg_color)
+        bg_color.setAlpha(int(self.opacity * 255))
+        self.setStyleSheet(_WINDOW_QSS_TMPL.format_map({
+            "bg": bg_color.name(QColor.NameFormat.HexArgb),
+            "fg": self.font_color,
+        }))
         
         # 更新标题栏样式
         if hasattr(self, 'title_label'):
-            self.title_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {self.font_color};
-                }}
-            """)
+            self.title_label.setStyleSheet(self._title_label_qss)
         
         logger.info("窗口样式已更新")
     
@@ -198,29 +535,15 @@ class ShortcutWindow(QWidget):
         if not process_name:
             return "未知应用"
         
-        # 移除 .exe 后缀
-        if process_name.lower().endswith('.exe'):
-            clean_name = process_name[:-4]
+        # 移除 .exe 后缀，只做一次大小写折叠
+        key = process_name.casefold()
+        if key.endswith(_EXE_SUFFIX):
+            clean_name = process_name[:-len(_EXE_SUFFIX)]
+            key = key[:-len(_EXE_SUFFIX)]
         else:
             clean_name = process_name
         
-        # 特殊应用名称映射
-        name_mapping = {
-            'chrome': 'Google Chrome',
-            'firefox': 'Mozilla Firefox',
-            'msedge': 'Microsoft Edge',
-            'notepad': '记事本',
-            'notepad++': 'Notepad++',
-            'code': 'Visual Studio Code',
-            'explorer': '文件资源管理器',
-            'winword': 'Microsoft Word',
-            'excel': 'Microsoft Excel',
-            'powerpnt': 'Microsoft PowerPoint',
-            'acad': 'AutoCAD',
-            'cass': 'CASS'
-        }
-        
-        return name_mapping.get(clean_name.lower(), clean_name)
+        return _NAME_MAPPING.get(key, clean_name)
     
     def show_shortcuts(self, process_name=""):
         """
@@ -228,20 +551,54 @@ class ShortcutWindow(QWidget):
         
         Args:
             process_name (str): 进程名称
+            
+        Returns:
+            bool: 窗口是否已显示
         """
-        self.clear_content()
+        self._ensure_ui()
         
+        # 先完成全部读取：屏幕尺寸只查询一次，传给后续的布局计算
+        screen_geom = QApplication.primaryScreen().geometry()
         shortcuts = self.shortcut_manager.get_shortcuts_for_process(process_name)
         
+        # 再集中修改内容和几何，期间暂停重绘，避免每一步都触发重新布局和绘制
+        self.setUpdatesEnabled(False)
+        try:
+            self.clear_content()
+            self._fill_content(process_name, shortcuts, screen_geom)
+            
+            # 调整窗口大小和位置
+            self.adjust_window_size(screen_geom)
+            self.center_on_screen(screen_geom)
+            
+            self.show()
+            self.raise_()
+        finally:
+            # 重新启用时 Qt 会自动安排一次完整的 update()
+            self.setUpdatesEnabled(True)
+        self.activateWindow()
+        return self.isVisible()
+    
+    def _fill_content(self, process_name, shortcuts, screen_geom):
+        """
+        填充卡片或空状态提示，并更新窗口标题
+        
+        Args:
+            process_name (str): 进程名称
+            shortcuts (list): 快捷键列表
+            screen_geom (QRect): 屏幕区域
+        """
         if not shortcuts:
-            no_shortcuts_label = QLabel("暂无快捷键配置")
-            no_shortcuts_label.setFont(QFont(self.font_family, self.font_size))
-            no_shortcuts_label.setStyleSheet(f"color: {self.font_color}; padding: 20px;")
-            no_shortcuts_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.content_layout.addWidget(no_shortcuts_label)
+            if self._empty_label is None:
+                self._empty_label = QLabel("暂无快捷键配置")
+                self._empty_label.setAlignment(_ALIGN_CENTER)
+                self.content_layout.addWidget(self._empty_label)
+            self._empty_label.setFont(self._empty_font)
+            self._empty_label.setStyleSheet(self._empty_label_qss)
+            self._empty_label.show()
             logger.info(f"进程 {process_name} 暂无快捷键配置")
         else:
-            self.create_card_layout(shortcuts)
+            self.create_card_layout(shortcuts, screen_geom)
             logger.info(f"已显示进程 {process_name} 的 {len(shortcuts)} 个快捷键")
         
         # 更新窗口标题
@@ -259,85 +616,87 @@ class ShortcutWindow(QWidget):
                 self.title_label.setText(f"{clean_name} - 快捷键 [通用配置]")
             else:
                 self.title_label.setText(f"{clean_name} - 快捷键")
-        
-        # 调整窗口大小和位置
-        self.adjust_window_size()
-        self.center_on_screen()
-        
-        self.show()
-        self.raise_()
-        self.activateWindow()
     
-    def create_card_layout(self, shortcuts):
+    def create_card_layout(self, shortcuts, screen_geom=None):
         """
-        创建卡片布局
+        创建卡片布局，复用卡片池中的部件，只在池不够用时新建卡片
         
         Args:
             shortcuts (list): 快捷键列表
+            screen_geom (QRect): 屏幕区域，为空时自行查询
         """
-        # 创建滚动区域
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background: transparent;
-            }
-            QScrollBar:vertical {
-                background: rgba(255, 255, 255, 0.1);
-                width: 8px;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:vertical {
-                background: rgba(255, 255, 255, 0.3);
-                border-radius: 4px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: rgba(255, 255, 255, 0.5);
-            }
-        """)
+        grid_layout = self._ensure_card_area()
         
-        # 创建容器widget
-        container = QWidget()
-        container.setStyleSheet("background: transparent;")
-        
-        # 创建网格布局
-        grid_layout = QGridLayout(container)
-        grid_layout.setSpacing(15)
-        grid_layout.setContentsMargins(20, 20, 20, 20)
+        # 取出上次排好的卡片（不销毁），重新按位置放入
+        while grid_layout.count():
+            grid_layout.takeAt(0)
         
         # 计算每行显示的卡片数量（响应式布局）
-        cards_per_row = self.calculate_cards_per_row(len(shortcuts))
+        cards_per_row = self.calculate_cards_per_row(len(shortcuts), screen_geom)
         
+        pool = self._card_pool
         for i, shortcut in enumerate(shortcuts):
-            card = self.create_shortcut_card(shortcut)
-            row = i // cards_per_row
-            col = i % cards_per_row
-            grid_layout.addWidget(card, row, col)
+            if i < len(pool):
+                entry = pool[i]
+            else:
+                entry = self._create_card_entry()
+                pool.append(entry)
+            self._bind_card(entry, shortcut)
+            grid_layout.addWidget(entry[0], i // cards_per_row, i % cards_per_row)
+            entry[0].show()
+        
+        # 多余的卡片隐藏起来留待下次使用
+        for entry in pool[len(shortcuts):]:
+            entry[0].hide()
         
-        # 设置列的拉伸因子，使卡片均匀分布
-        for col in range(cards_per_row):
-            grid_layout.setColumnStretch(col, 1)
+        # 设置列的拉伸因子，使卡片均匀分布；清掉上次多出来的列
+        for col in range(max(cards_per_row, self._grid_columns)):
+            grid_layout.setColumnStretch(col, 1 if col < cards_per_row else 0)
+        self._grid_columns = cards_per_row
         
-        scroll_area.setWidget(container)
-        self.content_layout.addWidget(scroll_area)
+        self._card_area.show()
+        # 卡片位置变化后重绘阴影
+        self._card_area.update()
     
-    def calculate_cards_per_row(self, total_cards):
+    def _ensure_card_area(self):
+        """
+        首次使用时创建放置卡片的网格容器，之后一直复用；
+        滚动由 init_ui 中的外层滚动区域负责
+        
+        Returns:
+            QGridLayout: 卡片网格布局
+        """
+        if self._card_area is not None:
+            return self._card_grid
+        
+        # 创建容器widget，卡片阴影由容器绘制
+        container = _CardContainer()
+        container.setProperty("shortcutTransparent", True)
+        
+        # 创建网格布局
+        grid_layout = QGridLayout(container)
+        grid_layout.setSpacing(15)
+        grid_layout.setContentsMargins(20, 20, 20, 20)
+        
+        self.content_layout.addWidget(container)
+        self._card_area, self._card_grid = container, grid_layout
+        return grid_layout
+    
+    def calculate_cards_per_row(self, total_cards, screen_geom=None):
         """
         根据窗口大小和卡片数量计算每行显示的卡片数量
         
         Args:
             total_cards (int): 总卡片数量
+            screen_geom (QRect): 屏幕区域，为空时自行查询
             
         Returns:
             int: 每行卡片数量
         """
         # 获取屏幕尺寸
-        screen = QApplication.primaryScreen().geometry()
-        screen_width = screen.width()
+        if screen_geom is None:
+            screen_geom = QApplication.primaryScreen().geometry()
+        screen_width = screen_geom.width()
         
         # 根据屏幕宽度确定每行卡片数量
         if screen_width >= 1920:  # 大屏幕
@@ -355,14 +714,18 @@ class ShortcutWindow(QWidget):
         else:
             return max_per_row
     
-    def adjust_window_size(self):
+    def adjust_window_size(self, screen_geom=None):
         """
         根据内容调整窗口大小
+        
+        Args:
+            screen_geom (QRect): 屏幕区域，为空时自行查询
         """
         # 获取屏幕尺寸
-        screen = QApplication.primaryScreen().geometry()
-        screen_width = screen.width()
-        screen_height = screen.height()
+        if screen_geom is None:
+            screen_geom = QApplication.primaryScreen().geometry()
+        screen_width = screen_geom.width()
+        screen_height = screen_geom.height()
         
         # 计算窗口大小（占屏幕的80%，但不超过最大尺寸）
         max_width = min(1200, int(screen_width * 0.8))
@@ -376,13 +739,17 @@ class ShortcutWindow(QWidget):
         self.setMaximumSize(max_width, max_height)
         self.resize(max_width, max_height)
     
-    def center_on_screen(self):
+    def center_on_screen(self, screen_geom=None):
         """
         将窗口居中显示在屏幕上
+        
+        Args:
+            screen_geom (QRect): 屏幕区域，为空时自行查询
         """
-        screen = QApplication.primaryScreen().geometry()
+        if screen_geom is None:
+            screen_geom = QApplication.primaryScreen().geometry()
         window_geometry = self.frameGeometry()
-        center_point = screen.center()
+        center_point = screen_geom.center()
         window_geometry.moveCenter(center_point)
         self.move(window_geometry.topLeft())
     
@@ -391,8 +758,33 @@ class ShortcutWindow(QWidget):
 
 
     def create_shortcut_card(self, shortcut, max_width=None, compact_mode=False, max_height=None):
-        from PyQt6.QtWidgets import QSizePolicy
+        """
+        创建一张独立的快捷键卡片（不进入卡片池）
+        
+        Args:
+            shortcut (Shortcut): 快捷键
+            max_width (int): 卡片最小宽度，为空时使用默认值
+            compact_mode (bool): 保留参数
+            max_height (int): 卡片参考高度，为空时使用默认值
+            
+        Returns:
+            QWidget: 卡片部件
+        """
+        entry = self._create_card_entry(max_width, max_height)
+        self._bind_card(entry, shortcut)
+        return entry[0]
+    
+    def _create_card_entry(self, max_width=None, max_height=None):
+        """
+        创建一张空白卡片，内容由 _bind_card 填充
         
+        Args:
+            max_width (int): 卡片最小宽度，为空时使用默认值
+            max_height (int): 卡片参考高度，为空时使用默认值
+            
+        Returns:
+            tuple: (卡片, 按键布局, 按键标签列表, 描述标签)
+        """
         card = QWidget()
         # 设置卡片尺寸
         if max_width:
@@ -411,119 +803,87 @@ class ShortcutWindow(QWidget):
             card.setMaximumHeight(160)
         
         # 设置大小策略为可扩展
-        card.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        
-        # 设置高对比度卡片样式
-        card.setStyleSheet(f"""
-            QWidget {{
-                background: rgba(40, 40, 40, 0.9);
-                border: 2px solid rgba(100, 149, 237, 0.5);
-                border-radius: 12px;
-            }}
-            QWidget:hover {{
-                background: rgba(50, 50, 50, 0.95);
-                border: 2px solid rgba(100, 149, 237, 0.8);
-            }}
-        """)
+        card.setSizePolicy(_EXPANDING, _EXPANDING)
         
-        # 添加阴影效果
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(15)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        shadow.setOffset(0, 5)
-        card.setGraphicsEffect(shadow)
+        # 高对比度卡片样式（见 SHORTCUT_QSS）
+        card.setProperty("shortcutCard", True)
         
         layout = QVBoxLayout(card)
         layout.setContentsMargins(15, 12, 15, 12)
         layout.setSpacing(8)
-
-        # 使用适中的字体
-        key_font_size = self.font_size + 1
-        desc_font_size = self.font_size - 1
-        key_padding = "4px 8px"
-        
-        # 智能处理多个快捷键的显示
-        key_text = shortcut["key"]
-        
-        # 检测是否包含多个快捷键（常见分隔符：/ 、 " / " 或 "或"）
-        if " / " in key_text or " 或 " in key_text or ("/" in key_text and " / " not in key_text):
-            # 分割多个快捷键
-            if " / " in key_text:
-                keys = key_text.split(" / ")
-            elif " 或 " in key_text:
-                keys = key_text.split(" 或 ")
-            elif "/" in key_text:
-                keys = key_text.split("/")
-            
-            # 创建垂直布局来显示多个快捷键
-            key_container = QWidget()
-            key_layout = QVBoxLayout(key_container)
-            key_layout.setContentsMargins(0, 0, 0, 0)
-            key_layout.setSpacing(3)  # 增加间距避免挤在一起
-            
+        
+        # 按键标签放在独立容器中，多个快捷键时逐行显示
+        key_container = QWidget()
+        key_container.setProperty("shortcutTransparent", True)
+        key_layout = QVBoxLayout(key_container)
+        key_layout.setContentsMargins(0, 0, 0, 0)
+        key_layout.setSpacing(3)  # 增加间距避免挤在一起
+        layout.addWidget(key_container)
+        
+        desc = QLabel()
+        desc.setProperty("shortcutDesc", True)
+        desc.setWordWrap(True)
+        desc.setAlignment(_ALIGN_CENTER)
+        
+        # 设置描述标签的大小策略
+        desc.setSizePolicy(_EXPANDING, _EXPANDING)
+        
+        layout.addWidget(desc)
+        
+        return card, key_layout, [], desc
+    
+    def _bind_card(self, entry, shortcut):
+        """
+        把快捷键内容填入卡片，按需补充按键标签，多余的隐藏
+        
+        Args:
+            entry (tuple): _create_card_entry 返回的卡片
+            shortcut (Shortcut): 快捷键
+        """
+        _, key_layout, key_labels, desc = entry
+        key_text = shortcut.key
+        
+        # 一次切分，同时检测是否包含多个快捷键（常见分隔符：/ 、 " / " 或 "或"）
+        keys = _KEY_SPLIT_RE.split(key_text)
+        if len(keys) > 1:
             # 根据快捷键数量调整字体大小
-            multi_key_font_size = max(8, key_font_size - 2) if len(keys) > 2 else max(9, key_font_size - 1)
-            
-            for i, single_key in enumerate(keys):
-                key_label = QLabel(single_key.strip())
-                key_label.setFont(QFont(self.font_family, multi_key_font_size, QFont.Weight.Bold))
-                key_label.setStyleSheet("""
-                    color: #ffffff;
-                    font-weight: bold;
-                    background: rgba(100, 149, 237, 0.8);
-                    border-radius: 4px;
-                    padding: 3px 6px;
-                    border: 1px solid rgba(100, 149, 237, 1.0);
-                    margin: 1px;
-                """)
-                key_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                key_label.setWordWrap(True)
-                key_layout.addWidget(key_label)
-            
-            layout.addWidget(key_container)
+            key_font = self._key_font_multi_small if len(keys) > 2 else self._key_font_multi
+            key_kind = "multi"
         else:
             # 单个快捷键的正常显示
-            key_label = QLabel(key_text)
-            key_label.setFont(QFont(self.font_family, key_font_size, QFont.Weight.Bold))
-            key_label.setStyleSheet(f"""
-                color: #ffffff;
-                font-weight: bold;
-                background: rgba(100, 149, 237, 0.8);
-                border-radius: 6px;
-                padding: 6px 10px;
-                border: 1px solid rgba(100, 149, 237, 1.0);
-            """)
-            key_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            key_font = self._key_font_single
+            key_kind = "single"
+        
+        while len(key_labels) < len(keys):
+            key_label = QLabel()
+            key_label.setAlignment(_ALIGN_CENTER)
             key_label.setWordWrap(True)
-            layout.addWidget(key_label)
-
-        desc = QLabel(shortcut["desc"]) 
-        desc.setFont(QFont(self.font_family, desc_font_size))
-        desc.setStyleSheet("""
-            color: #ffffff;
-            background: transparent;
-            padding: 4px;
-            font-weight: normal;
-        """)
-        desc.setWordWrap(True)
-        desc.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            key_layout.addWidget(key_label)
+            key_labels.append(key_label)
         
-        # 设置描述标签的大小策略
-        desc.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-
-        layout.addWidget(desc)
-
-        return card
+        for key_label, single_key in zip(key_labels, keys):
+            key_label.setText(single_key)
+            key_label.setFont(key_font)
+            if key_label.property("shortcutKey") != key_kind:
+                key_label.setProperty("shortcutKey", key_kind)
+                # 属性变化后需要重新套用样式
+                key_label.style().unpolish(key_label)
+                key_label.style().polish(key_label)
+            key_label.show()
+        for key_label in key_labels[len(keys):]:
+            key_label.hide()
+        
+        desc.setText(shortcut.desc)
+        desc.setFont(self._desc_font)
     
     def clear_content(self):
         """
-        清空内容区域
+        清空内容区域；部件只隐藏不销毁，下次显示时复用
         """
-        # 清除所有子部件
-        while self.content_layout.count():
-            item = self.content_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        if self._card_area is not None:
+            self._card_area.hide()
+        if self._empty_label is not None:
+            self._empty_label.hide()
         
         logger.info("内容区域已清空")
     
@@ -548,6 +908,7 @@ class ShortcutWindow(QWidget):
         """
         if event.buttons() == Qt.MouseButton.LeftButton and self.dragging:
             self.move(event.position().toPoint() - self.drag_position)
+            self.request_save()
             event.accept()
     
     def mouseReleaseEvent(self, event: QMouseEvent):
@@ -561,6 +922,16 @@ class ShortcutWindow(QWidget):
             self.dragging = False
             event.accept()
     
+    def closeEvent(self, event):
+        """
+        关闭事件处理，写入尚未执行的延迟保存
+        
+        Args:
+            event: 关闭事件
+        """
+        self._flush_pending_save()
+        super().closeEvent(event)
+    
     def keyPressEvent(self, event):
         """
         按键事件处理，ESC键隐藏窗口
@@ -580,21 +951,25 @@ if __name__ == "__main__":
     
     app = QApplication(sys.argv)
     
+    from shortcut_manager import Shortcut
+    
     # 创建一个示例快捷键管理器
     class DummyShortcutManager:
+        shortcuts = {}
+        
         def get_shortcuts_for_process(self, process_name, allow_default=True):
-            return [
-                {"key": "Ctrl+C", "desc": "复制"},
-                {"key": "Ctrl+V", "desc": "粘贴"},
-                {"key": "Ctrl+Z", "desc": "撤销"},
-                {"key": "Ctrl+Y", "desc": "重做"},
-                {"key": "Ctrl+A", "desc": "全选"},
-                {"key": "Ctrl+S", "desc": "保存"},
-                {"key": "Ctrl+O", "desc": "打开"},
-                {"key": "Ctrl+N", "desc": "新建"},
-                {"key": "Ctrl+F", "desc": "查找"},
-                {"key": "Ctrl+H", "desc": "替换"},
-            ]
+            return (
+                Shortcut("Ctrl+C", "复制"),
+                Shortcut("Ctrl+V", "粘贴"),
+                Shortcut("Ctrl+Z", "撤销"),
+                Shortcut("Ctrl+Y", "重做"),
+                Shortcut("Ctrl+A", "全选"),
+                Shortcut("Ctrl+S", "保存"),
+                Shortcut("Ctrl+O", "打开"),
+                Shortcut("Ctrl+N", "新建"),
+                Shortcut("Ctrl+F", "查找"),
+                Shortcut("Ctrl+H", "替换"),
+            )
     
     shortcut_manager = DummyShortcutManager()
     window = ShortcutWindow(shortcut_manager)
@@ -655,55 +1030,50 @@ class FlowLayout(QLayout):
     def _do_layout(self, rect, test_only):
         left, top, right, bottom = self.getContentsMargins()
         effective_rect = rect.adjusted(+left, +top, -right, -bottom)
-        x = effective_rect.x()
-        y = effective_rect.y()
-        line_height = 0
-
-        line_items = []
-        line_width = 0
-        total_height = 0
-
-        def place_line(start_y):
-            nonlocal total_height
-            if not line_items:
-                return 0
-            # 计算行内总宽度
-            total_w = sum(i.sizeHint().width() for i in line_items)
-            total_w += self._hspacing * (len(line_items) - 1) if len(line_items) > 1 else 0
-            # 计算起始x以实现居中
-            if self._center_lines:
-                start_x = effective_rect.x() + max(0, (effective_rect.width() - total_w) // 2)
-            else:
-                start_x = effective_rect.x()
-            # 布局行内元素
-            cx = start_x
-            max_h = 0
-            for it in line_items:
-                w = it.sizeHint().width()
-                h = it.sizeHint().height()
-                if not test_only:
-                    it.setGeometry(QRect(cx, start_y, w, h))
-                cx += w + self._hspacing
-                max_h = max(max_h, h)
-            total_height += max_h + self._vspacing
-            return max_h
+        left_x = effective_rect.x()
+        avail_w = effective_rect.width()
+        hspacing = self._hspacing
+        vspacing = self._vspacing
 
+        # 每个元素只取一次 sizeHint，之后只做整数运算
+        hints = []
         for item in self._item_list:
             hint = item.sizeHint()
-            next_x = x + hint.width()
-            if line_items and (next_x - effective_rect.x() > effective_rect.width()):
+            hints.append((item, hint.width(), hint.height()))
+
+        y = effective_rect.y()
+        total_height = 0
+        line = []
+        line_w = 0  # 行内元素宽度与间距之和
+        line_h = 0
+        for entry in hints:
+            w, h = entry[1], entry[2]
+            if line and line_w + hspacing + w > avail_w:
                 # 换行并布局上一行
-                y += place_line(y) + 0
-                line_items = []
-                x = effective_rect.x()
-                line_width = 0
-                line_height = 0
-            line_items.append(item)
-            x += hint.width() + self._hspacing
-            line_width += hint.width() + self._hspacing
-            line_height = max(line_height, hint.height())
+                if not test_only:
+                    self._place_line(line, line_w, left_x, avail_w, y)
+                y += line_h
+                total_height += line_h + vspacing
+                line = []
+                line_w = line_h = 0
+            line_w = line_w + hspacing + w if line else w
+            line_h = max(line_h, h)
+            line.append(entry)
         # 最后一行
-        if line_items:
-            place_line(y)
+        if line:
+            if not test_only:
+                self._place_line(line, line_w, left_x, avail_w, y)
+            total_height += line_h + vspacing
         # 返回总高度
         return total_height + bottom + top
+
+    def _place_line(self, line, line_w, left_x, avail_w, y):
+        # 计算起始x以实现居中
+        if self._center_lines:
+            cx = left_x + max(0, (avail_w - line_w) // 2)
+        else:
+            cx = left_x
+        hspacing = self._hspacing
+        for item, w, h in line:
+            item.setGeometry(QRect(cx, y, w, h))
+            cx += w + hspacing
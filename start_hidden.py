@@ -9,6 +9,53 @@ import sys
 import os
 import subprocess
 
+
+def _running_windowless():
+    """
+    判断当前解释器是否本身就是无控制台的 pythonw
+    
+    Returns:
+        bool: 是否运行在 pythonw 下
+    """
+    return os.path.basename(sys.executable or "").lower() in ("pythonw.exe", "pythonw")
+
+
+def _run_in_process(current_dir):
+    """
+    在当前进程中直接运行主程序，省去再启动一个解释器的开销
+    
+    Args:
+        current_dir (str): 程序所在目录
+        
+    Returns:
+        int: 主程序退出码
+    """
+    # 与子进程方式保持一致的工作目录（日志文件写在程序目录下）
+    os.chdir(current_dir)
+    if current_dir not in sys.path:
+        sys.path.insert(0, current_dir)
+    import main as shortcut_main
+    return shortcut_main.ShortcutTool().run()
+
+
+def _spawn_detached(args, cwd):
+    """
+    以脱离当前进程的方式启动子进程，不继承句柄和标准输入输出，
+    包装脚本随后可以立即退出
+    
+    Args:
+        args (list): 命令行参数
+        cwd (str): 子进程工作目录
+    """
+    kwargs = dict(cwd=cwd, close_fds=True,
+                  stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if sys.platform == "win32":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NO_WINDOW
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(args, **kwargs)
+
+
 def main():
     """
     无窗口启动主程序
@@ -23,22 +70,18 @@ def main():
             print(f"错误: 找不到主程序文件 {main_script}")
             return 1
         
+        # 已经运行在 pythonw 下时没有控制台，直接在本进程中启动
+        if _running_windowless():
+            return _run_in_process(current_dir)
+        
         # 使用pythonw启动主程序（无窗口）
         try:
             # 尝试使用pythonw（无控制台窗口）
-            subprocess.Popen(["pythonw", main_script], 
-                           cwd=current_dir,
-                           creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0)
+            _spawn_detached(["pythonw", main_script], current_dir)
             print("快捷键提示工具已在后台启动")
         except FileNotFoundError:
             # 如果pythonw不可用，使用python但隐藏窗口
-            if sys.platform == "win32":
-                subprocess.Popen(["python", main_script], 
-                               cwd=current_dir,
-                               creationflags=subprocess.CREATE_NO_WINDOW)
-            else:
-                subprocess.Popen(["python", main_script], 
-                               cwd=current_dir)
+            _spawn_detached(["python", main_script], current_dir)
             print("快捷键提示工具已启动")
         
         return 0
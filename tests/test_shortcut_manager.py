@@ -0,0 +1,53 @@
+import json
+import logging
+import sys
+
+import pytest
+
+import shortcut_manager
+from shortcut_manager import ShortcutManager
+
+VALID = {
+    "default": [{"key": "Ctrl+C", "desc": "复制"}],
+    "code.exe": [{"key": "Ctrl+P", "desc": "快速打开"}],
+}
+
+INVALID_CHANGES = {
+    "bad key": {"Bad": [{"key": "F1", "desc": "帮助"}]},
+    "missing desc": {"code.exe": [{"key": "Ctrl+P"}]},
+    "not a list": {"code.exe": {"key": "Ctrl+P", "desc": "快速打开"}},
+}
+
+
+@pytest.fixture(params=["fastjsonschema", "jsonschema"])
+def backend(request, monkeypatch):
+    """分别在 fastjsonschema 和 jsonschema 两种校验库下运行"""
+    pytest.importorskip(request.param)
+    if request.param == "jsonschema":
+        # 让 fastjsonschema 导入失败，回退到 jsonschema
+        monkeypatch.setitem(sys.modules, "fastjsonschema", None)
+    shortcut_manager._get_validators.cache_clear()
+    yield request.param
+    shortcut_manager._get_validators.cache_clear()
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.mark.parametrize("change", list(INVALID_CHANGES.values()), ids=list(INVALID_CHANGES))
+def test_reload_rejects_invalid_changed_block(tmp_path, caplog, backend, change):
+    path = tmp_path / "shortcuts.json"
+    _write(path, VALID)
+    manager = ShortcutManager(str(path))
+    assert manager.get_shortcuts_for_process("code.exe")[0].desc == "快速打开"
+
+    _write(path, {**VALID, **change})
+    with caplog.at_level(logging.INFO, logger="shortcut_manager"):
+        assert manager.reload() is False
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert any(m.startswith("JSON schema 校验失败") for m in messages)
+    assert "将使用默认配置" in messages
+    assert not any(m.startswith("加载快捷键配置失败") for m in messages)
+    assert manager.shortcuts is shortcut_manager._FROZEN_DEFAULTS